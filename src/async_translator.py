@@ -0,0 +1,135 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from translator import CHUNK_SIZE, _initialize_worker, _process_piece
+import asyncio
+import concurrent.futures
+
+
+class AsyncTranslator:
+    """
+    Translates text and files from within an event loop without blocking it. The files of each translation are read
+    and written within a thread dedicated to that translation, while the text itself is processed either within the
+    default thread pool of the event loop or within a pool of processes. The translator, including its mapping, is
+    shared by every translation, and is sent to each process of the pool only once.
+
+    Each translation may be cancelled, in which case it stops once the chunk being processed is complete.
+
+    :param translator: The Translator used for every translation.
+    :param max_concurrency: The maximum number of translations performed at once.
+    :param processes: The number of processes within which the text is processed. If none is provided, the text is
+        processed within the default thread pool of the event loop.
+    """
+
+    def __init__(self, translator, max_concurrency=8, processes=None):
+        self.translator = translator
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = None
+        if processes is not None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                processes, initializer=_initialize_worker, initargs=(translator,)
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the pool of processes, if one exists, cancelling any chunks not yet being processed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def translate_async(self, text):
+        """
+        Replaces each word within the given text with its mapped counterpart and formats the output.
+
+        :param text: The text to be translated.
+        :return: The translated text.
+        """
+        async with self._semaphore:
+            output, _, _ = await self._process(text, "", 0)
+            return output.strip()
+
+    async def translate_file_async(self, input_path, output_path=None, from_pdf=False, chunk_size=CHUNK_SIZE,
+                                   pages=None):
+        """
+        Replaces each word within the text from a given TXT or PDF file with its mapped counterpart, formats the
+        output, and saves it to a given TXT file. The file is read, processed, and written one chunk at a time, or one
+        page at a time for PDF files.
+
+        :param input_path: The path to a TXT or PDF file containing the text to be converted.
+        :param output_path: The path to a TXT file to which the output will be saved. Paths ending in .gz, .bz2, or .xz
+            are compressed as they are written.
+        :param from_pdf: Whether the input file is a PDF file.
+        :param chunk_size: The number of characters read from the input file at a time.
+        :param pages: The numbers of the pages read from the PDF file, starting from one. If none are provided, every
+            page is read.
+        :return: If no output path is provided, the processed text will be directly returned.
+        """
+        translator = self.translator
+        loop = asyncio.get_running_loop()
+        inout = concurrent.futures.ThreadPoolExecutor(1)
+        async with self._semaphore:
+            if from_pdf:
+                chunks = translator._iter_pdf(input_path, pages)
+            else:
+                chunks = translator._iter_txt(input_path, chunk_size)
+            chunks = translator._split_chunks(chunks)
+            opened = None
+            outputs = []
+            try:
+                if output_path is not None:
+                    opened = await loop.run_in_executor(inout, translator._open_txt, output_path, "w")
+                previous = ""
+                line_length = 0
+                started = False
+                pending = ""
+                while True:
+                    chunk = await loop.run_in_executor(inout, next, chunks, None)
+                    if chunk is None:
+                        break
+                    output, previous, line_length = await self._process(chunk, previous, line_length)
+                    output, started, pending = translator._strip_output(output, started, pending)
+                    if not output:
+                        continue
+                    if opened is None:
+                        outputs.append(output)
+                    else:
+                        await loop.run_in_executor(inout, opened.write, output)
+            finally:
+                closed = [inout.submit(chunks.close)]
+                if opened is not None:
+                    closed.append(inout.submit(opened.close))
+                inout.shutdown(wait=False)
+            for future in closed:
+                await asyncio.wrap_future(future)
+        if output_path is None:
+            return "".join(outputs)
+
+    async def _process(self, text, previous, line_length):
+        """
+        Processes a chunk of text within the pool used by this instance.
+
+        :param text: The chunk of text to be processed and formatted.
+        :param previous: The final formatted word of the preceding chunk.
+        :param line_length: The length of the current line within the output at the end of the preceding chunk.
+        :return: The processed and formatted chunk, followed by the final formatted word and the line length left
+            at its end.
+        """
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            parts, previous, line_length = await loop.run_in_executor(
+                None, self.translator._process_chunk, text, previous, line_length
+            )
+            return "".join(parts), previous, line_length
+        output, previous, line_length, unknown, _ = await loop.run_in_executor(
+            self._executor, _process_piece, text, previous, line_length
+        )
+        if self.translator.read_only:
+            self.translator.unknown_words.update(unknown)
+        return output, previous, line_length
@@ -0,0 +1,364 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ORTHOGRAPHY_DIR = os.path.join(ROOT, "ipa_to_orthography")
+REAL_TEXT = os.path.join(ROOT, os.pardir, "README.md")
+IPA_FILE = os.path.join(ORTHOGRAPHY_DIR, "en_US_ipa.txt")
+MAPPING_MODULE = "ipa_to_orthography.orthography"
+RESULTS_FILE = "benchmark.json"
+HEAVY_MODULES = ("pdfplumber", "concurrent.futures")
+
+SEED = 0
+BLOCK_SIZE = 2 ** 16
+SIZES = (2 ** 10, 2 ** 15, 2 ** 20, 2 ** 25)
+PDF_SIZES = (2 ** 15, 2 ** 20)
+CORPORA = ("synthetic", "real")
+REPEATS = 3
+PUNCTUATION = (".", ",", "!", "?", ";", "\n")
+WORD_REGEX = r"[\w']+"
+
+PDF_LINE_LENGTH = 90
+PDF_LINES_PER_PAGE = 60
+SHORT_TEXT_SIZE = 64
+
+ROW_FORMAT = "%-22s %-10s %10s %12s %10s %10s %10s\n"
+HEADER_ROW = ("benchmark", "corpus", "bytes", "words/s", "MB/s", "RSS MB", "change")
+
+
+def synthetic_text(words, size, seed=SEED):
+    """
+    Produces a piece of text of a given size from randomly chosen words and punctuation marks. A single block of
+    text is generated and then repeated, such that large inputs may be produced quickly.
+
+    :param words: A list of the words from which the text is built.
+    :param size: The number of characters within the text.
+    :param seed: The seed of the random number generator used to choose each word.
+    :return: The generated text.
+    """
+    generator = random.Random(seed)
+    parts = []
+    length = 0
+    while length < min(size, BLOCK_SIZE):
+        part = generator.choice(words)
+        if generator.random() < 0.1:
+            part += generator.choice(PUNCTUATION)
+        part += " "
+        parts.append(part)
+        length += len(part)
+    block = "".join(parts)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def real_text(size, path=REAL_TEXT):
+    """
+    Produces a piece of text of a given size by repeating the text of a given file.
+
+    :param size: The number of characters within the text.
+    :param path: The path of the file containing the text.
+    :return: The produced text.
+    """
+    with open(path, "r") as opened:
+        block = opened.read()
+    return (block * (size // len(block) + 1))[:size]
+
+
+def write_pdf(text, path):
+    """
+    Writes a given piece of text to a minimal PDF file, such that PDF extraction may be measured without any
+    dependency beyond pdfplumber itself. Characters outside of Latin-1 are replaced.
+
+    :param text: The text to be written.
+    :param path: The path of the output file.
+    """
+    lines = []
+    for line in text.splitlines():
+        lines.extend(line[index:index + PDF_LINE_LENGTH] for index in range(0, max(len(line), 1), PDF_LINE_LENGTH))
+    pages = [lines[index:index + PDF_LINES_PER_PAGE] for index in range(0, max(len(lines), 1), PDF_LINES_PER_PAGE)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % (4 + 2 * index) for index in range(len(pages))), len(pages)
+        ),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for index, page in enumerate(pages):
+        shown = b"".join(
+            b"(%s) '\n" % line.encode("latin-1", "replace").replace(b"\\", b"\\\\")
+            .replace(b"(", b"\\(").replace(b")", b"\\)")
+            for line in page
+        )
+        content = b"BT\n/F1 10 Tf\n12 TL\n40 800 Td\n" + shown + b"ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % (5 + 2 * index))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as opened:
+        opened.write(output)
+
+
+def best_time(function, repeats=REPEATS):
+    """
+    Measures the fastest of several calls to a given function.
+
+    :param function: The function to be called.
+    :param repeats: The number of times the function is called.
+    :return: The number of seconds taken by the fastest call.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the current process.
+
+    :return: The peak resident set size in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(case):
+    """
+    Runs a single benchmark within the current process. Each benchmark is run within a fresh process, such that the
+    peak resident set size reported belongs to that benchmark alone.
+
+    :param case: A dictionary describing the benchmark, containing its name, corpus, and size.
+    :return: A dictionary containing the measurements taken.
+    """
+    name = case["name"]
+    if name == "startup":
+        start = time.perf_counter()
+        from lazy_mapping import LazyMapping
+        from translator import Translator
+        imported = time.perf_counter() - start
+        Translator(LazyMapping(MAPPING_MODULE)).translate("startup")
+        return {
+            "import_seconds": imported,
+            "seconds": time.perf_counter() - start,
+            "pdfplumber_imported": "pdfplumber" in sys.modules,
+            "peak_rss": peak_rss(),
+        }
+    if name == "generate_orthography":
+        sys.path.insert(0, ORTHOGRAPHY_DIR)
+        from orthographer import Orthographer
+        with open(IPA_FILE, "r") as opened:
+            text = opened.read()
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "orthography.py")
+            seconds = best_time(lambda: Orthographer().generate_orthography(IPA_FILE, output))
+        return measurements(text, seconds)
+
+    from ipa_to_orthography import orthography
+    from translator import Translator
+    if case["corpus"] == "synthetic":
+        text = synthetic_text(sorted(orthography.MAPPING), case["size"])
+    else:
+        text = real_text(case["size"])
+    translator = Translator(orthography.MAPPING, read_only=True)
+    if name == "translate":
+        return measurements(text, best_time(lambda: translator.translate(text)))
+    if name == "translate_each" or name == "translate_many":
+        texts = [text[index:index + SHORT_TEXT_SIZE] for index in range(0, len(text), SHORT_TEXT_SIZE)]
+        if name == "translate_many":
+            return measurements(text, best_time(lambda: translator.translate_many(texts)))
+        return measurements(text, best_time(lambda: [translator.translate(short) for short in texts]))
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "out.txt")
+        if name == "translate_file_pdf":
+            path = os.path.join(directory, "in.pdf")
+            write_pdf(text, path)
+            return measurements(text, best_time(lambda: translator.translate_file(path, output, from_pdf=True)))
+        path = os.path.join(directory, "in.txt")
+        with open(path, "w") as opened:
+            opened.write(text)
+        return measurements(text, best_time(lambda: translator.translate_file(path, output)))
+
+
+def check_imports(modules=HEAVY_MODULES):
+    """
+    Imports the translator within a fresh interpreter and finds which of a series of slow-loading modules it
+    imported, such that translating plain text never pays the cost of loading them.
+
+    :param modules: The names of the modules which the translator should not import.
+    :return: A list of the names of the modules which were imported.
+    """
+    script = "import json, sys, translator; sys.stdout.write(json.dumps([module for module in %r if module in " \
+             "sys.modules]))" % (list(modules),)
+    completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def measurements(text, seconds):
+    """
+    Derives the throughput of a benchmark from the text it processed and the time it took.
+
+    :param text: The text processed by the benchmark.
+    :param seconds: The number of seconds taken.
+    :return: A dictionary containing the measurements.
+    """
+    size = len(text.encode("utf-8"))
+    words = len(re.findall(WORD_REGEX, text))
+    return {
+        "bytes": size,
+        "words": words,
+        "seconds": seconds,
+        "words_per_second": words / seconds,
+        "mb_per_second": size / seconds / 2 ** 20,
+        "peak_rss": peak_rss(),
+    }
+
+
+def cases(sizes=SIZES, pdf_sizes=PDF_SIZES, corpora=CORPORA):
+    """
+    Lists every benchmark to be run.
+
+    :param sizes: The sizes of the inputs of the text benchmarks, in characters.
+    :param pdf_sizes: The sizes of the inputs of the PDF benchmarks, in characters.
+    :param corpora: The corpora from which each input is produced.
+    :return: A list of dictionaries describing each benchmark.
+    """
+    listed = [{"name": "startup", "corpus": None, "size": None}]
+    for corpus in corpora:
+        for size in sizes:
+            listed.append({"name": "translate", "corpus": corpus, "size": size})
+            listed.append({"name": "translate_file_txt", "corpus": corpus, "size": size})
+            listed.append({"name": "translate_each", "corpus": corpus, "size": size})
+            listed.append({"name": "translate_many", "corpus": corpus, "size": size})
+        if pdfplumber_available():
+            for size in pdf_sizes:
+                listed.append({"name": "translate_file_pdf", "corpus": corpus, "size": size})
+    listed.append({"name": "generate_orthography", "corpus": "en_US", "size": None})
+    return listed
+
+
+def pdfplumber_available():
+    """
+    Checks whether pdfplumber may be imported without importing it.
+
+    :return: Whether pdfplumber is installed.
+    """
+    import importlib.util
+    return importlib.util.find_spec("pdfplumber") is not None
+
+
+def key(case):
+    """
+    Returns the key under which the results of a given benchmark are saved.
+
+    :param case: A dictionary describing the benchmark.
+    :return: The key of the benchmark.
+    """
+    return "%s/%s/%s" % (case["name"], case["corpus"], case["size"])
+
+
+def run(listed, baseline=None):
+    """
+    Runs each of a series of benchmarks within its own process, writing a row of results for each.
+
+    :param listed: A list of dictionaries describing each benchmark.
+    :param baseline: The results of a previous run to which each result is compared.
+    :return: A dictionary mapping the key of each benchmark to its results.
+    """
+    results = {}
+    sys.stdout.write(ROW_FORMAT % HEADER_ROW)
+    for case in listed:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        result = dict(case, **json.loads(completed.stdout))
+        results[key(case)] = result
+        sys.stdout.write(ROW_FORMAT % row(result, (baseline or {}).get(key(case))))
+    return results
+
+
+def row(result, previous=None):
+    """
+    Formats the results of a single benchmark as a row of the output table.
+
+    :param result: The results of the benchmark.
+    :param previous: The results of the same benchmark within a previous run.
+    :return: A tuple containing each column of the row.
+    """
+    if "words_per_second" in result:
+        speed = ("%.0f" % result["words_per_second"], "%.2f" % result["mb_per_second"])
+    else:
+        speed = ("%.1f ms" % (result["seconds"] * 1000), "")
+    change = ""
+    if previous is not None:
+        change = "%+.1f%%" % ((previous["seconds"] / result["seconds"] - 1) * 100)
+    return (result["name"], result["corpus"] or "", result["size"] or "") + speed + (
+        "%.1f" % (result["peak_rss"] / 2 ** 20), change
+    )
+
+
+def main():
+    """
+    Parses the command line arguments, then either checks the imports of the translator, runs a single benchmark, or
+    runs every benchmark and saves the results.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the translation pipeline.")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=RESULTS_FILE, help="The path to which the JSON results are saved.")
+    parser.add_argument("--compare", help="The path of previous JSON results to which the results are compared.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="The sizes of the text inputs.")
+    parser.add_argument("--pdf-sizes", type=int, nargs="+", default=PDF_SIZES, help="The sizes of the PDF inputs.")
+    parser.add_argument("--corpora", nargs="+", default=CORPORA, choices=CORPORA, help="The corpora to be used.")
+    parser.add_argument("--check-imports", action="store_true",
+                        help="Only check that importing the translator loads none of the slow-loading modules, exiting "
+                             "with a non-zero status if it does.")
+    arguments = parser.parse_args()
+
+    if arguments.check_imports:
+        imported = check_imports()
+        if imported:
+            sys.exit("Importing the translator imported " + ", ".join(imported) + ".")
+        sys.stdout.write("Importing the translator imported none of " + ", ".join(HEAVY_MODULES) + ".\n")
+        return
+
+    if arguments.case is not None:
+        sys.stdout.write(json.dumps(run_case(json.loads(arguments.case))))
+        return
+    baseline = None
+    if arguments.compare is not None:
+        with open(arguments.compare, "r") as opened:
+            baseline = json.load(opened)["results"]
+    results = run(cases(arguments.sizes, arguments.pdf_sizes, arguments.corpora), baseline)
+    with open(arguments.output, "w") as opened:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processors": os.cpu_count(),
+            "results": results,
+        }, opened, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from ipa_to_orthography.file_utils import hash_file, save_atomically
+import concurrent.futures
+import hashlib
+import json
+import os
+
+
+MANIFEST_NAME = ".manifest.json"
+TXT_EXTENSIONS = (".txt", ".txt.gz", ".txt.bz2", ".txt.xz")
+PDF_EXTENSIONS = (".pdf",)
+SAVE_INTERVAL = 1000
+
+OPTIONS = ("capitalize", "break_lines", "max_line_length", "delimiter", "stoppers", "specials")
+
+
+def mapping_version(mapping):
+    """
+    Computes a hash identifying the translations produced by a given mapping. Words mapped to themselves are ignored,
+    as they are translated identically to words without a mapping, such that the words added to a mapping during
+    translation never change its version.
+
+    :param mapping: The dictionary mapping a series of words with their replacements.
+    :return: The SHA-256 hash of the mapping, as a hexadecimal string.
+    """
+    digest = hashlib.sha256()
+    for key, value in sorted((key, value) for key, value in mapping.items() if key != value):
+        digest.update(key.encode("utf-8") + b"\0" + value.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+class Corpus:
+    """
+    Translates every TXT and PDF file within a directory tree into a mirrored tree of TXT files, recording the hash of
+    each input file, the version of the mapping, and the formatting options within a manifest. Files whose entry
+    within the manifest is unchanged are skipped on later runs. The text of each PDF file is saved alongside it with
+    an added .txt extension, while compressed TXT files are saved compressed.
+
+    :param translator: The Translator used to translate each file.
+    :param input_dir: The root of the directory tree containing the input files.
+    :param output_dir: The root of the directory tree to which the output files are saved.
+    :param manifest_path: The path of the manifest. If none is provided, the manifest is saved within the output
+        directory.
+    :param version: A string identifying the version of the mapping. If none is provided, the mapping is hashed.
+    """
+
+    def __init__(self, translator, input_dir, output_dir, manifest_path=None, version=None):
+        self.translator = translator
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+        self.version = version
+
+    def translate(self, workers=1, force=False):
+        """
+        Translates every changed file within the input directory.
+
+        :param workers: The number of processes among which the files are divided.
+        :param force: Whether every file will be translated regardless of the manifest.
+        :return: A dictionary containing a list of the translated files, a list of the skipped files, and a dictionary
+            mapping each file which could not be translated to its error, each file given relative to the input
+            directory.
+        """
+        manifest = self._load_manifest()
+        version = self.version or mapping_version(self.translator.mapping)
+        options = {option: getattr(self.translator, option) for option in OPTIONS}
+        summary = {"translated": [], "skipped": [], "failed": {}}
+        entries = {}
+        pending = []
+        for relative in self._documents():
+            entry = self._fingerprint(relative, manifest.get(relative))
+            entry["version"] = version
+            entry["options"] = options
+            previous = manifest.get(relative)
+            if not force and previous == entry and os.path.exists(self._output_path(relative)):
+                entries[relative] = entry
+                summary["skipped"].append(relative)
+            else:
+                pending.append((relative, entry))
+
+        tasks = [(self._input_path(relative), self._output_path(relative), relative.lower().endswith(PDF_EXTENSIONS))
+                 for relative, _ in pending]
+        if workers > 1 and tasks:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_initialize_worker, initargs=(self.translator,)
+            )
+            with executor:
+                results = executor.map(_translate_document, tasks)
+                self._collect(pending, results, entries, summary)
+        else:
+            _initialize_worker(self.translator)
+            self._collect(pending, map(_translate_document, tasks), entries, summary)
+        self._save_manifest(entries)
+        return summary
+
+    def _collect(self, pending, results, entries, summary):
+        """
+        Records the result of each translated file, saving the manifest periodically such that an interrupted run
+        need not repeat the files already translated.
+
+        :param pending: A list of tuples containing each translated file and its manifest entry.
+        :param results: An iterable of the error raised while translating each file, or None if none was raised.
+        :param entries: The dictionary of manifest entries to which each successful entry is added.
+        :param summary: The dictionary to which the result of each file is added.
+        """
+        for count, ((relative, entry), error) in enumerate(zip(pending, results), 1):
+            if error is None:
+                entries[relative] = entry
+                summary["translated"].append(relative)
+            else:
+                summary["failed"][relative] = error
+            if count % SAVE_INTERVAL == 0:
+                self._save_manifest(entries)
+
+    def _documents(self):
+        """
+        Lists every TXT and PDF file within the input directory.
+
+        :return: A sorted list of the paths of the files, relative to the input directory.
+        """
+        documents = []
+        for directory, _, files in os.walk(self.input_dir):
+            for name in files:
+                if name.lower().endswith(TXT_EXTENSIONS + PDF_EXTENSIONS):
+                    documents.append(os.path.relpath(os.path.join(directory, name), self.input_dir))
+        return sorted(documents)
+
+    def _input_path(self, relative):
+        """
+        Returns the full path of a given file within the input directory.
+
+        :param relative: The path of the file, relative to the input directory.
+        :return: The path of the file.
+        """
+        return os.path.join(self.input_dir, relative)
+
+    def _output_path(self, relative):
+        """
+        Returns the path to which the translation of a given file is saved, mirroring its place within the input
+        directory. PDF files are translated into TXT files named after them.
+
+        :param relative: The path of the input file, relative to the input directory.
+        :return: The path of the output file.
+        """
+        if relative.lower().endswith(PDF_EXTENSIONS):
+            relative += ".txt"
+        return os.path.join(self.output_dir, relative)
+
+    def _fingerprint(self, relative, previous):
+        """
+        Identifies the contents of a given file. The file is only hashed if its size or modification time differ from
+        those recorded within the manifest.
+
+        :param relative: The path of the file, relative to the input directory.
+        :param previous: The entry of the file within the manifest, if one exists.
+        :return: A dictionary containing the size, modification time, and hash of the file.
+        """
+        path = self._input_path(relative)
+        status = os.stat(path)
+        entry = {"size": status.st_size, "mtime": status.st_mtime_ns}
+        if previous is not None and previous.get("size") == entry["size"] and previous.get("mtime") == entry["mtime"]:
+            entry["hash"] = previous["hash"]
+            return entry
+        entry["hash"] = hash_file(path)
+        return entry
+
+    def _load_manifest(self):
+        """
+        Reads the manifest if it exists.
+
+        :return: A dictionary mapping each file to its manifest entry, which is empty if there is no manifest.
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r") as opened:
+            return json.load(opened)
+
+    def _save_manifest(self, entries):
+        """
+        Overwrites the manifest with a given set of entries.
+
+        :param entries: The dictionary mapping each file to its manifest entry.
+        """
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        save_atomically(self.manifest_path, lambda opened: json.dump(entries, opened, sort_keys=True))
+
+
+_worker_translator = None
+
+
+def _initialize_worker(translator):
+    """
+    Stores the translator used by a worker process of a pool created by Corpus.translate.
+
+    :param translator: The translator used to translate each file.
+    """
+    global _worker_translator
+    _worker_translator = translator
+
+
+def _translate_document(task):
+    """
+    Translates a single file within a worker process of a pool created by Corpus.translate.
+
+    :param task: A tuple containing the path of the input file, the path of the output file, and whether the input
+        file is a PDF file.
+    :return: A description of the error raised while translating the file, or None if none was raised.
+    """
+    input_path, output_path, from_pdf = task
+    try:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _worker_translator.translate_file(input_path, output_path, from_pdf=from_pdf, stream=True)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return None
@@ -0,0 +1,201 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from ipa_to_orthography.file_utils import hash_file
+import os
+import sqlite3
+import time
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "orthographic_translator", "pdf_text.sqlite3")
+DEFAULT_MAX_SIZE = 2 ** 30
+EVICTION_BATCH = 64
+ACCESS_BATCH = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    file_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (file_hash, page)
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed);
+CREATE TABLE IF NOT EXISTS documents (
+    file_hash TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM pages;
+CREATE TRIGGER IF NOT EXISTS pages_inserted AFTER INSERT ON pages BEGIN
+    UPDATE totals SET size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS pages_updated AFTER UPDATE OF size ON pages BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS pages_deleted AFTER DELETE ON pages BEGIN
+    UPDATE totals SET size = size - OLD.size;
+END;
+"""
+
+
+class ExtractionCache:
+    """
+    Stores the text extracted from each page of a PDF file within a SQLite database, keyed by the hash of the
+    contents of the file and the number of the page, such that a file is never extracted twice regardless of its
+    path. Once the total size of the stored text exceeds the maximum size, the least recently read pages are
+    removed. The total size is kept up to date by the database itself, and the times at which pages are read are
+    saved in batches rather than after every read.
+
+    :param path: The path of the database file.
+    :param max_size: The maximum total size of the stored text, in bytes.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._accessed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def hash_file(file):
+        """
+        Computes the hash of the contents of a given file.
+
+        :param file: The path of the file.
+        :return: The SHA-256 hash of the file, as a hexadecimal string.
+        """
+        return hash_file(file)
+
+    def get(self, file_hash, page):
+        """
+        Returns the stored text of a given page, marking it as recently read.
+
+        :param file_hash: The hash of the file containing the page.
+        :param page: The number of the page.
+        :return: The text of the page, or None if it is not stored.
+        """
+        row = self._connection.execute(
+            "SELECT text FROM pages WHERE file_hash = ? AND page = ?", (file_hash, page)
+        ).fetchone()
+        if row is None:
+            return None
+        self._accessed.append((time.time(), file_hash, page))
+        if len(self._accessed) >= ACCESS_BATCH:
+            self._flush_accessed()
+        return row[0]
+
+    def __contains__(self, key):
+        file_hash, page = key
+        return self._connection.execute(
+            "SELECT 1 FROM pages WHERE file_hash = ? AND page = ?", (file_hash, page)
+        ).fetchone() is not None
+
+    def put(self, file_hash, page, text):
+        """
+        Stores the text of a given page, then removes the least recently read pages if the maximum size is exceeded.
+
+        :param file_hash: The hash of the file containing the page.
+        :param page: The number of the page.
+        :param text: The text of the page.
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?) ON CONFLICT (file_hash, page) DO UPDATE SET "
+                "text = excluded.text, size = excluded.size, accessed = excluded.accessed",
+                (file_hash, page, text, len(text.encode("utf-8")), time.time())
+            )
+            if self.size > self.max_size:
+                self._flush_accessed()
+                self._evict()
+
+    def get_page_count(self, file_hash):
+        """
+        Returns the stored number of pages within a given file.
+
+        :param file_hash: The hash of the file.
+        :return: The number of pages, or None if it is not stored.
+        """
+        row = self._connection.execute(
+            "SELECT page_count FROM documents WHERE file_hash = ?", (file_hash,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put_page_count(self, file_hash, page_count):
+        """
+        Stores the number of pages within a given file.
+
+        :param file_hash: The hash of the file.
+        :param page_count: The number of pages.
+        """
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO documents VALUES (?, ?)", (file_hash, page_count))
+
+    @property
+    def size(self):
+        """
+        The total size of the stored text, in bytes.
+        """
+        return self._connection.execute("SELECT size FROM totals").fetchone()[0]
+
+    def clear(self):
+        """
+        Removes every stored page.
+        """
+        self._accessed.clear()
+        with self._connection:
+            self._connection.execute("DELETE FROM pages")
+            self._connection.execute("DELETE FROM documents")
+
+    def close(self):
+        """
+        Saves the times at which pages were read, then closes the connection to the database.
+        """
+        self._flush_accessed()
+        self._connection.close()
+
+    def _flush_accessed(self):
+        """
+        Saves the times at which pages were read since the last save within a single transaction.
+        """
+        if not self._accessed:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE pages SET accessed = ? WHERE file_hash = ? AND page = ?", self._accessed
+            )
+        self._accessed.clear()
+
+    def _evict(self):
+        """
+        Removes the least recently read pages until the total size of the stored text no longer exceeds the maximum
+        size.
+        """
+        excess = self.size - self.max_size
+        while excess > 0:
+            rows = self._connection.execute(
+                "SELECT file_hash, page, size FROM pages ORDER BY accessed LIMIT ?", (EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                return
+            for file_hash, page, size in rows:
+                if excess <= 0:
+                    return
+                self._connection.execute("DELETE FROM pages WHERE file_hash = ? AND page = ?", (file_hash, page))
+                excess -= size
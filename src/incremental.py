@@ -0,0 +1,90 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from collections import OrderedDict
+import hashlib
+import re
+
+
+PARAGRAPH_REGEX = r"\n(?:[ \t\r\f\v]*\n)+"
+OPTIONS = ("capitalize", "break_lines", "max_line_length", "delimiter", "stoppers", "specials")
+
+
+class IncrementalTranslator:
+    """
+    Translates successive versions of a document, reusing the translation of each paragraph left unchanged since a
+    previous version. Each paragraph is cached alongside the formatting state it was translated from and the state it
+    left behind. As a newline resets the formatting state, a paragraph following an edited paragraph is reused
+    as long as its own text is unchanged, such that only the edited paragraphs are translated again.
+
+    The cache is cleared whenever the formatting options of the translator change. Changes to its mapping are not
+    detected, and require the cache to be cleared manually.
+
+    :param translator: The Translator used to translate each paragraph.
+    :param max_paragraphs: The maximum number of paragraphs cached at once.
+    """
+
+    def __init__(self, translator, max_paragraphs=100000):
+        self.translator = translator
+        self.max_paragraphs = max_paragraphs
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._options = None
+        self._paragraph_pattern = re.compile(PARAGRAPH_REGEX)
+
+    def translate(self, text):
+        """
+        Replaces each word within the given text with its mapped counterpart and formats the output, translating only
+        the paragraphs which are not cached.
+
+        :param text: The text to be translated.
+        :return: The translated text.
+        """
+        options = tuple(getattr(self.translator, option) for option in OPTIONS)
+        if options != self._options:
+            self.clear()
+            self._options = options
+        parts = []
+        previous = ""
+        line_length = 0
+        for paragraph in self._split_paragraphs(text):
+            key = (previous, line_length, hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).digest())
+            cached = self._cache.get(key)
+            if cached is None:
+                self.misses += 1
+                formatted, end_previous, end_line_length = self.translator._process_chunk(
+                    paragraph, previous, line_length
+                )
+                cached = ("".join(formatted), end_previous, end_line_length)
+                self._cache[key] = cached
+                if len(self._cache) > self.max_paragraphs:
+                    self._cache.popitem(last=False)
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+            output, previous, line_length = cached
+            parts.append(output)
+        return self.translator._join_stripped(parts)
+
+    def clear(self):
+        """
+        Forgets every cached paragraph.
+        """
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _split_paragraphs(self, text):
+        """
+        Splits a given piece of text into paragraphs, each ending on the blank lines which follow it.
+
+        :param text: The text to be split.
+        :return: A generator yielding each paragraph.
+        """
+        start = 0
+        for match in self._paragraph_pattern.finditer(text):
+            yield text[start:match.end()]
+            start = match.end()
+        if start < len(text):
+            yield text[start:]
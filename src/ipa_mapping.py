@@ -0,0 +1,107 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from ipa_to_orthography.orthographer import Orthographer
+import time
+
+
+class IpaMapping(MutableMapping):
+    """
+    A dictionary which converts each word from its pronunciation expressed in the International Phonetic Alphabet
+    (IPA) when the word is first accessed, such that no pregenerated mapping is needed and a change to the sounds of
+    the orthography takes effect without regenerating one. The pronunciations are read from the same file used by the
+    Orthographer on first access, and the most recently converted words are kept in a bounded cache.
+
+    Words added to the dictionary, such as those added by a Translator which is not read-only, are kept separately
+    and take precedence over their pronunciations.
+
+    :param path: The path of the file mapping each word with its pronunciation.
+    :param orthographer: The Orthographer used to convert each pronunciation. If none is provided, an Orthographer
+        using the sounds within from_ipa.py is created.
+    :param max_size: The maximum number of converted words cached at once.
+    """
+
+    def __init__(self, path, orthographer=None, max_size=2 ** 16):
+        self.path = path
+        self.orthographer = orthographer or Orthographer()
+        self.max_size = max_size
+        self.load_time = None
+        self.hits = 0
+        self.misses = 0
+        self._pronunciations = None
+        self._converted = OrderedDict()
+        self._added = {}
+
+    def __reduce__(self):
+        return type(self), (self.path, self.orthographer, self.max_size)
+
+    @property
+    def loaded(self):
+        """
+        Whether the pronunciations have been read.
+        """
+        return self._pronunciations is not None
+
+    def load(self):
+        """
+        Reads the pronunciation of every word if they have not yet been read, recording the number of seconds taken
+        within the load_time attribute.
+
+        :return: A dictionary mapping each word with its pronunciation.
+        """
+        if self._pronunciations is None:
+            start = time.perf_counter()
+            with open(self.path, "r") as opened:
+                self._pronunciations = dict(map(self.orthographer._split_line, opened))
+            self.load_time = time.perf_counter() - start
+        return self._pronunciations
+
+    def clear_cache(self):
+        """
+        Forgets every converted word, such as after the sounds of the orthographer change.
+        """
+        self._converted.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, key):
+        if key in self._added:
+            return self._added[key]
+        converted = self._converted.get(key)
+        if converted is not None:
+            self.hits += 1
+            self._converted.move_to_end(key)
+            return converted
+        converted = self.orthographer._ipa_to_new(self.load()[key])
+        self.misses += 1
+        self._converted[key] = converted
+        if len(self._converted) > self.max_size:
+            self._converted.popitem(last=False)
+        return converted
+
+    def __setitem__(self, key, value):
+        self._added[key] = value
+
+    def __delitem__(self, key):
+        pronunciations = self.load()
+        if key not in self._added and key not in pronunciations:
+            raise KeyError(key)
+        self._added.pop(key, None)
+        pronunciations.pop(key, None)
+        self._converted.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._added or key in self.load()
+
+    def __iter__(self):
+        pronunciations = self.load()
+        yield from pronunciations
+        for key in self._added:
+            if key not in pronunciations:
+                yield key
+
+    def __len__(self):
+        pronunciations = self.load()
+        return len(pronunciations) + sum(key not in pronunciations for key in self._added)
@@ -0,0 +1,193 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from collections.abc import Mapping
+import mmap
+import struct
+import sys
+
+
+OUTPUT_FILE = "orthography.bin"
+
+MAGIC = b"ORTH"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+OFFSET = struct.Struct("<I")
+
+
+def compile_mapping(mapping, path):
+    """
+    Writes a dictionary mapping a series of words with their replacements to a compact binary file which may be
+    searched in place by a BinaryMapping. The file consists of a header, a table of offsets into a blob containing
+    every key, a table of offsets into a blob containing every value, and both blobs, with the keys sorted by their
+    UTF-8 encoding.
+
+    :param mapping: The dictionary to be compiled.
+    :param path: The path of the output file.
+    """
+    items = sorted((key.encode("utf-8"), value.encode("utf-8")) for key, value in mapping.items())
+    key_offsets = [0]
+    value_offsets = [0]
+    for key, value in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+    if HEADER.size + OFFSET.size * 2 * len(key_offsets) + key_offsets[-1] + value_offsets[-1] >= 2 ** 32:
+        raise ValueError("The mapping is too large to be compiled.")
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, len(items)))
+        output.write(struct.pack("<%dI" % len(key_offsets), *key_offsets))
+        output.write(struct.pack("<%dI" % len(value_offsets), *value_offsets))
+        output.write(b"".join(key for key, _ in items))
+        output.write(b"".join(value for _, value in items))
+
+
+class BinaryMapping(Mapping):
+    """
+    A read-only dictionary backed by a binary file produced by compile_mapping. The file is memory-mapped and
+    searched in place, such that opening it takes constant time and its pages are shared between every process
+    reading the same file.
+
+    :param path: The path of the binary file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as opened:
+            self._buffer = mmap.mmap(opened.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self._buffer.close()
+            raise ValueError(f"{repr(path)} is not a compiled mapping.")
+        self._key_offsets = HEADER.size
+        self._value_offsets = self._key_offsets + OFFSET.size * (self._count + 1)
+        self._keys = self._value_offsets + OFFSET.size * (self._count + 1)
+        self._values = self._keys + self._offset(self._key_offsets, self._count)
+        self._tables = None
+        if sys.byteorder == "little":
+            view = memoryview(self._buffer)
+            self._tables = (
+                view[self._key_offsets:self._value_offsets].cast("I"),
+                view[self._value_offsets:self._keys].cast("I"),
+            )
+            view.release()
+
+    def __reduce__(self):
+        return type(self), (self.path,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._key(index).decode("utf-8")
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return self._value(index)
+
+    def get(self, key, default=None):
+        """
+        Returns the value mapped to a given key if such a mapping exists. Otherwise, returns the given default.
+
+        :param key: The key to have its value returned.
+        :param default: The value returned if the key has no mapping.
+        :return: The value mapped to the given key, or the default.
+        """
+        index = self._find(key)
+        return default if index is None else self._value(index)
+
+    def setdefault(self, key, default=None):
+        """
+        Returns the value mapped to a given key if such a mapping exists. Otherwise, returns the given default. As the
+        mapping is read-only, the default is not inserted.
+
+        :param key: The key to have its value returned.
+        :param default: The value returned if the key has no mapping.
+        :return: The value mapped to the given key, or the default.
+        """
+        return self.get(key, default)
+
+    def close(self):
+        """
+        Closes the underlying memory map.
+        """
+        if self._tables is not None:
+            for table in self._tables:
+                table.release()
+        self._buffer.close()
+
+    def _offset(self, table, index):
+        """
+        Reads a single offset from one of the tables of offsets within the file.
+
+        :param table: The position of the table within the file.
+        :param index: The index of the offset within the table.
+        :return: The offset.
+        """
+        return OFFSET.unpack_from(self._buffer, table + OFFSET.size * index)[0]
+
+    def _key(self, index):
+        """
+        Reads the key at a given index within the file, using the unpacked tables of offsets if they exist.
+
+        :param index: The index of the key.
+        :return: The key, encoded in UTF-8.
+        """
+        if self._tables is not None:
+            keys = self._tables[0]
+            return self._buffer[self._keys + keys[index]:self._keys + keys[index + 1]]
+        start = self._keys + self._offset(self._key_offsets, index)
+        end = self._keys + self._offset(self._key_offsets, index + 1)
+        return self._buffer[start:end]
+
+    def _value(self, index):
+        """
+        Reads the value at a given index within the file, using the unpacked tables of offsets if they exist.
+
+        :param index: The index of the value.
+        :return: The decoded value.
+        """
+        if self._tables is not None:
+            values = self._tables[1]
+            return self._buffer[self._values + values[index]:self._values + values[index + 1]].decode("utf-8")
+        start = self._values + self._offset(self._value_offsets, index)
+        end = self._values + self._offset(self._value_offsets, index + 1)
+        return self._buffer[start:end].decode("utf-8")
+
+    def _find(self, key):
+        """
+        Performs a binary search for a given key within the file.
+
+        :param key: The key to be found.
+        :return: The index of the key within the file, or None if the key is not present.
+        """
+        if not isinstance(key, str):
+            return None
+        encoded = key.encode("utf-8")
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(low) == encoded:
+            return low
+        return None
+
+
+if __name__ == "__main__":
+    import orthography
+    compile_mapping(orthography.MAPPING, OUTPUT_FILE)
@@ -0,0 +1,40 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+import os
+
+
+HASH_BLOCK_SIZE = 2 ** 20
+
+
+def hash_file(file):
+    """
+    Computes the hash of the contents of a given file, reading it one block at a time. The hashlib module is only
+    imported once a file is hashed, such that modules saving files never pay the cost of importing it.
+
+    :param file: The path of the file.
+    :return: The SHA-256 hash of the file, as a hexadecimal string.
+    """
+    import hashlib
+    digest = hashlib.sha256()
+    with open(file, "rb") as opened:
+        for block in iter(lambda: opened.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_atomically(file, save, mode="w"):
+    """
+    Overwrites a given file by writing a temporary file alongside it, which then replaces the file at once, such
+    that an interrupted save never corrupts it.
+
+    :param file: The path of the file.
+    :param save: A function called with the temporary file object, writing the contents of the file.
+    :param mode: The mode in which the temporary file is opened.
+    """
+    temporary = file + ".tmp"
+    with open(temporary, mode) as opened:
+        save(opened)
+        opened.flush()
+        os.fsync(opened.fileno())
+    os.replace(temporary, file)
@@ -0,0 +1,161 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+try:
+    from .file_utils import save_atomically
+    from .mapping_formats import PATCHERS, get_format, patch_mapping
+    from .orthographer import DICT_NAME, Orthographer
+except ImportError:
+    from file_utils import save_atomically
+    from mapping_formats import PATCHERS, get_format, patch_mapping
+    from orthographer import DICT_NAME, Orthographer
+import os
+import pickle
+
+
+INDEX_SUFFIX = ".index"
+
+
+class IncrementalOrthographer:
+    """
+    Regenerates the output of an Orthographer after its dictionaries of sounds change, converting again only the words
+    whose pronunciations contain a changed sound. An index saved alongside the output records the pronunciation and
+    converted form of every word, and maps each sound to the words whose pronunciations contain it.
+
+    The output is generated in full if no index exists, or if the input file, the output file, the format of the
+    output, or the options of the Orthographer other than its sounds have changed since the index was saved. Words
+    which change are patched into SQLite output in place, while other formats are rewritten from the index without
+    converting any unchanged word.
+
+    :param orthographer: The Orthographer used to convert each word.
+    """
+
+    def __init__(self, orthographer):
+        self.orthographer = orthographer
+
+    def update_orthography(self, path_in, path_out, index_path=None, dict_name=DICT_NAME, output_format=None):
+        """
+        Brings the output file up to date with the sounds of the orthographer.
+
+        :param path_in: The path of the input file.
+        :param path_out: The path of the output file.
+        :param index_path: The path of the index. If none is provided, the index is saved alongside the output file.
+        :param dict_name: The name of the output Python dictionary.
+        :param output_format: The format of the output file. If none is provided, the format is determined from the
+            extension of the output file, defaulting to "python".
+        :return: The number of words converted.
+        """
+        output_format = output_format or get_format(path_out, "python")
+        index_path = index_path or path_out + INDEX_SUFFIX
+        status = os.stat(path_in)
+        source = {"path": os.path.abspath(path_in), "size": status.st_size, "mtime": status.st_mtime_ns}
+        options = {
+            "removed": self.orthographer.removed,
+            "delimiter": self.orthographer.delimiter,
+            "mapping": self.orthographer.mapping,
+            "dict_name": dict_name,
+            "output_format": output_format,
+            "output": os.path.abspath(path_out),
+        }
+        state = self._load_index(index_path)
+        if state is None or state["source"] != source or state["options"] != options or not os.path.exists(path_out):
+            state = self._generate(path_in, path_out, output_format, dict_name)
+            state["source"] = source
+            state["options"] = options
+            self._save_index(index_path, state)
+            return len(state["entries"])
+
+        sounds = self.orthographer.sounds
+        previous = state["sounds"]
+        entries = state["entries"]
+        index = state["index"]
+        changed = {key for key in previous.keys() | sounds.keys() if previous.get(key) != sounds.get(key)}
+        if not changed:
+            return 0
+        affected = set()
+        for key in changed:
+            affected.update(index.get(key, ()))
+            if len(key) > 1 and key not in previous:
+                affected.update(position for position, (_, ipa, _) in enumerate(entries) if key in ipa)
+
+        former = Orthographer(previous, {})
+        patched = set()
+        for position in affected:
+            word, ipa, new = entries[position]
+            for sound in former._get_sounds(ipa):
+                index[sound].discard(position)
+            for sound in self.orthographer._get_sounds(ipa):
+                index.setdefault(sound, set()).add(position)
+            updated = self.orthographer._ipa_to_new(ipa)
+            if updated != new:
+                entries[position] = (word, ipa, updated)
+                patched.add(word)
+
+        if patched:
+            if output_format in PATCHERS:
+                values = {word: new for word, _, new in entries}
+                patch_mapping(path_out, [(word, values[word]) for word in patched], output_format, dict_name)
+            else:
+                self._write(path_out, entries, output_format, dict_name)
+        state["sounds"] = sounds
+        self._save_index(index_path, state)
+        return len(affected)
+
+    def _generate(self, path_in, path_out, output_format, dict_name):
+        """
+        Converts every word within the input file, writes the output file, and builds the index.
+
+        :param path_in: The path of the input file.
+        :param path_out: The path of the output file.
+        :param output_format: The format of the output file.
+        :param dict_name: The name of the output Python dictionary.
+        :return: A dictionary containing the sounds of the orthographer, each word alongside its pronunciation and
+            converted form, and the index of each sound.
+        """
+        orthographer = self.orthographer
+        with open(path_in, "r") as ipa:
+            entries = [(word, pronunciation, orthographer._ipa_to_new(pronunciation))
+                       for word, pronunciation in map(orthographer._split_line, ipa)]
+        index = {}
+        for position, (_, pronunciation, _) in enumerate(entries):
+            for sound in orthographer._get_sounds(pronunciation):
+                index.setdefault(sound, set()).add(position)
+        self._write(path_out, entries, output_format, dict_name)
+        return {"sounds": orthographer.sounds, "entries": entries, "index": index}
+
+    def _write(self, path_out, entries, output_format, dict_name):
+        """
+        Writes the converted form of every word within the index to the output file in full.
+
+        :param path_out: The path of the output file.
+        :param entries: A list of tuples containing each word, its pronunciation, and its converted form.
+        :param output_format: The format of the output file.
+        :param dict_name: The name of the output Python dictionary.
+        """
+        pairs = ((word, new) for word, _, new in entries)
+        if output_format == "python":
+            pairs = (self.orthographer.mapping % pair for pair in pairs)
+        self.orthographer._write_orthography(path_out, [pairs], output_format, dict_name)
+
+    @staticmethod
+    def _load_index(index_path):
+        """
+        Reads the index if it exists.
+
+        :param index_path: The path of the index.
+        :return: The dictionary saved within the index, or None if there is no index.
+        """
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path, "rb") as opened:
+            return pickle.load(opened)
+
+    @staticmethod
+    def _save_index(index_path, state):
+        """
+        Overwrites the index.
+
+        :param index_path: The path of the index.
+        :param state: The dictionary to be saved.
+        """
+        save_atomically(index_path, lambda opened: pickle.dump(state, opened, pickle.HIGHEST_PROTOCOL), "wb")
@@ -0,0 +1,307 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+try:
+    from .binary_mapping import BinaryMapping, compile_mapping
+except ImportError:
+    from binary_mapping import BinaryMapping, compile_mapping
+import importlib.util
+import json
+import marshal
+import os
+import pickle
+import sqlite3
+
+
+DICT_NAME = "MAPPING"
+
+EXTENSIONS = {
+    ".py": "python",
+    ".json": "json",
+    ".tsv": "tsv",
+    ".sqlite3": "sqlite",
+    ".sqlite": "sqlite",
+    ".db": "sqlite",
+    ".pickle": "pickle",
+    ".pkl": "pickle",
+    ".marshal": "marshal",
+    ".bin": "binary",
+}
+
+
+def get_format(path, default=None):
+    """
+    Determines the format of a mapping file from its extension.
+
+    :param path: The path of the mapping file.
+    :param default: The name of the format returned if the extension is not recognized. If none is provided, an
+        unrecognized extension raises a ValueError.
+    :return: The name of the format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in EXTENSIONS:
+        return EXTENSIONS[extension]
+    if default is None:
+        raise ValueError(f"The format of {repr(path)} cannot be determined from its extension.")
+    return default
+
+
+def write_mapping(path, pairs, mapping_format=None, name=DICT_NAME):
+    """
+    Writes a series of words and their replacements to a file in a given format. Python files are written by the
+    Orthographer itself, as their layout is set by its format strings.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param mapping_format: The name of the format. If none is provided, it is determined from the extension of the
+        path.
+    :param name: The name of the dictionary within the file, used by the SQLite format as the name of its table.
+    """
+    mapping_format = mapping_format or get_format(path)
+    if mapping_format not in WRITERS:
+        raise ValueError(f"Mappings cannot be written in the {repr(mapping_format)} format.")
+    WRITERS[mapping_format](path, pairs, name)
+
+
+def load_mapping(path, mapping_format=None, name=DICT_NAME):
+    """
+    Loads a dictionary mapping a series of words with their replacements from a file written in a given format.
+
+    :param path: The path of the mapping file.
+    :param mapping_format: The name of the format. If none is provided, it is determined from the extension of the
+        path.
+    :param name: The name of the dictionary within the file.
+    :return: The loaded dictionary, or a read-only BinaryMapping for binary files.
+    """
+    mapping_format = mapping_format or get_format(path)
+    if mapping_format not in LOADERS:
+        raise ValueError(f"Mappings cannot be loaded from the {repr(mapping_format)} format.")
+    return LOADERS[mapping_format](path, name)
+
+
+def patch_mapping(path, pairs, mapping_format=None, name=DICT_NAME):
+    """
+    Replaces the values of a series of words within an existing mapping file without rewriting the rest of the file.
+    Only formats listed within PATCHERS may be patched.
+
+    :param path: The path of the mapping file.
+    :param pairs: An iterable of tuples containing each word and its new replacement.
+    :param mapping_format: The name of the format. If none is provided, it is determined from the extension of the
+        path.
+    :param name: The name of the dictionary within the file.
+    """
+    mapping_format = mapping_format or get_format(path)
+    if mapping_format not in PATCHERS:
+        raise ValueError(f"Mappings cannot be patched in the {repr(mapping_format)} format.")
+    PATCHERS[mapping_format](path, pairs, name)
+
+
+def _write_json(path, pairs, name):
+    """
+    Writes a series of words and their replacements to a JSON object, one pair at a time, such that the pairs are never
+    held in memory at once.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the dictionary, which is not stored within JSON files.
+    """
+    with open(path, "w", encoding="utf-8") as output:
+        separator = "{\n"
+        for word, new in pairs:
+            output.write(separator + json.dumps(word, ensure_ascii=False) + ": " + json.dumps(new, ensure_ascii=False))
+            separator = ",\n"
+        output.write("{}" if separator == "{\n" else "\n}\n")
+
+
+def _load_json(path, name):
+    """
+    Loads a dictionary from a JSON file.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary, which is not stored within JSON files.
+    :return: The loaded dictionary.
+    """
+    with open(path, "r", encoding="utf-8") as opened:
+        return json.load(opened)
+
+
+def _write_tsv(path, pairs, name):
+    """
+    Writes a series of words and their replacements to a file containing one tab-separated pair per line.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the dictionary, which is not stored within TSV files.
+    """
+    with open(path, "w", encoding="utf-8") as output:
+        output.writelines(f"{word}\t{new}\n" for word, new in pairs)
+
+
+def _load_tsv(path, name):
+    """
+    Loads a dictionary from a file containing one tab-separated pair per line.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary, which is not stored within TSV files.
+    :return: The loaded dictionary.
+    """
+    with open(path, "r", encoding="utf-8") as opened:
+        return dict(line.rstrip("\n").split("\t", 1) for line in opened)
+
+
+def _write_sqlite(path, pairs, name):
+    """
+    Writes a series of words and their replacements to a new SQLite database, replacing any existing file.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the table within the database.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute(f'CREATE TABLE "{name}" (word TEXT PRIMARY KEY, new TEXT NOT NULL) WITHOUT ROWID')
+            connection.executemany(f'INSERT OR REPLACE INTO "{name}" VALUES (?, ?)', pairs)
+    finally:
+        connection.close()
+
+
+def _patch_sqlite(path, pairs, name):
+    """
+    Replaces the values of a series of words within an existing SQLite database, inserting any word not yet present.
+
+    :param path: The path of the mapping file.
+    :param pairs: An iterable of tuples containing each word and its new replacement.
+    :param name: The name of the table within the database.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executemany(f'INSERT OR REPLACE INTO "{name}" VALUES (?, ?)', pairs)
+    finally:
+        connection.close()
+
+
+def _load_sqlite(path, name):
+    """
+    Loads a dictionary from a table of a SQLite database.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the table within the database.
+    :return: The loaded dictionary.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        return dict(connection.execute(f'SELECT word, new FROM "{name}"'))
+    finally:
+        connection.close()
+
+
+def _write_pickle(path, pairs, name):
+    """
+    Writes a series of words and their replacements to a file as a pickled dictionary.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the dictionary, which is not stored within pickle files.
+    """
+    with open(path, "wb") as output:
+        pickle.dump(dict(pairs), output, pickle.HIGHEST_PROTOCOL)
+
+
+def _load_pickle(path, name):
+    """
+    Loads a dictionary from a pickle file.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary, which is not stored within pickle files.
+    :return: The loaded dictionary.
+    """
+    with open(path, "rb") as opened:
+        return pickle.load(opened)
+
+
+def _write_marshal(path, pairs, name):
+    """
+    Writes a series of words and their replacements to a file as a marshalled dictionary.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the dictionary, which is not stored within marshal files.
+    """
+    with open(path, "wb") as output:
+        marshal.dump(dict(pairs), output)
+
+
+def _load_marshal(path, name):
+    """
+    Loads a dictionary from a marshal file.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary, which is not stored within marshal files.
+    :return: The loaded dictionary.
+    """
+    with open(path, "rb") as opened:
+        return marshal.load(opened)
+
+
+def _write_binary(path, pairs, name):
+    """
+    Compiles a series of words and their replacements into a sorted binary file read by BinaryMapping.
+
+    :param path: The path of the output file.
+    :param pairs: An iterable of tuples containing each word and its replacement.
+    :param name: The name of the dictionary, which is not stored within binary files.
+    """
+    compile_mapping(dict(pairs), path)
+
+
+def _load_binary(path, name):
+    """
+    Opens a binary file as a read-only mapping, without loading its contents into memory.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary, which is not stored within binary files.
+    :return: A BinaryMapping reading the file.
+    """
+    return BinaryMapping(path)
+
+
+def _load_python(path, name):
+    """
+    Loads a dictionary from a Python file by executing it as a module.
+
+    :param path: The path of the mapping file.
+    :param name: The name of the dictionary within the module.
+    :return: The loaded dictionary.
+    """
+    specification = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(specification)
+    specification.loader.exec_module(module)
+    return getattr(module, name)
+
+
+WRITERS = {
+    "json": _write_json,
+    "tsv": _write_tsv,
+    "sqlite": _write_sqlite,
+    "pickle": _write_pickle,
+    "marshal": _write_marshal,
+    "binary": _write_binary,
+}
+
+LOADERS = {
+    "python": _load_python,
+    "json": _load_json,
+    "tsv": _load_tsv,
+    "sqlite": _load_sqlite,
+    "pickle": _load_pickle,
+    "marshal": _load_marshal,
+    "binary": _load_binary,
+}
+
+PATCHERS = {
+    "sqlite": _patch_sqlite,
+}
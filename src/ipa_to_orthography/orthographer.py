@@ -1,7 +1,15 @@
 # Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
 # Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
 
-from from_ipa import *
+from collections import deque
+try:
+    from .from_ipa import *
+    from .mapping_formats import get_format, write_mapping
+except ImportError:
+    from from_ipa import *
+    from mapping_formats import get_format, write_mapping
+import concurrent.futures
+import itertools
 import re
 
 
@@ -11,6 +19,8 @@ OUTPUT_FILE = "orthography.py"
 DICT_NAME = "MAPPING"
 REMOVED_CHARS = "/ˈˌ,"
 SPLIT_REGEX = r"[ \t]"
+PLACEHOLDER_START = 0x100000
+LINE_CHUNK_SIZE = 2 ** 12
 
 HEADER_FORMAT = "\n%s = {\n"
 MAPPING_FORMAT = '\t"%s": "%s",\n'
@@ -28,27 +38,53 @@ class Orthographer:
         with an equivalent string of text.
     :param from_ipa_two: A dictionary mapping every sound represented by two characters within the IPA
         with an equivalent string of text.
+    :param rules: A dictionary mapping sounds represented by any number of characters within the IPA, such as
+        triphthongs or affricates written with tie bars, with an equivalent string of text. Its entries take
+        precedence over those of the preceding dictionaries.
     :param removed: A string containing every character to be removed from each line of the input file during
         processing.
     :param delimiter: A regex string containing the text along which each line of the input file is to be split.
     :param header: The format of the opening line of the output Python dictionary.
     :param mapping: The format of each content line of the output Python dictionary.
     :param footer: The format of the closing line of the output Python dictionary.
+
+    The dictionaries of sounds are compiled into a regex and a translation table, which are compiled again whenever
+    any of the dictionaries is replaced or edited in place.
     """
 
     def __init__(self, from_ipa_one=ONE_CHAR_KEYS, from_ipa_two=TWO_CHAR_KEYS,
                  removed=REMOVED_CHARS, delimiter=SPLIT_REGEX,
-                 header=HEADER_FORMAT, mapping=MAPPING_FORMAT, footer=FOOTER_FORMAT
+                 header=HEADER_FORMAT, mapping=MAPPING_FORMAT, footer=FOOTER_FORMAT, rules=None
                  ):
         self.from_ipa_one = from_ipa_one
         self.from_ipa_two = from_ipa_two
+        self.rules = rules
         self.removed = removed
         self.delimiter = delimiter
         self.header = header
         self.mapping = mapping
         self.footer = footer
 
-    def generate_orthography(self, path_in, path_out, dict_name=DICT_NAME):
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        if key in ("from_ipa_one", "from_ipa_two", "rules") and hasattr(self, "rules"):
+            self.__compile_rules()
+        elif key == "removed":
+            self.__removed_table = {ord(char): None for char in value}
+        elif key == "delimiter":
+            self.__delimiter_pattern = re.compile(value)
+
+    @property
+    def sounds(self):
+        """
+        A dictionary mapping every sound within the orthography with its equivalent string of text, merged from the
+        dictionaries of sounds.
+        """
+        self.__refresh_rules()
+        return dict(self.__sounds)
+
+    def generate_orthography(self, path_in, path_out, dict_name=DICT_NAME, workers=1, chunk_size=LINE_CHUNK_SIZE,
+                             output_format=None):
         """
         Given a text file mapping a series of words with their pronunciations expressed in the International Phonetic
         Alphabet (IPA), a Python dictionary is generated mapping each word to its equivalent in the given
@@ -57,15 +93,63 @@ class Orthographer:
         :param path_in: The path of the input file.
         :param path_out: The path of the output file.
         :param dict_name: The name of the output Python dictionary.
+        :param workers: The number of processes among which chunks of lines are divided. The output is written in the
+            order of the input file regardless of the number of processes.
+        :param chunk_size: The number of lines converted by a process at a time.
+        :param output_format: The format of the output file, being one of "python", "json", "tsv", "sqlite", "pickle",
+            "marshal", or "binary", each of which may be loaded back using mapping_formats.load_mapping. If none is
+            provided, the format is determined from the extension of the output file, defaulting to "python".
+        """
+        output_format = output_format or get_format(path_out, "python")
+        formatted = output_format == "python"
+        self.__refresh_rules()
+        with open(path_in, "r") as ipa:
+            if workers > 1:
+                converted = self._convert_parallel(ipa, workers, chunk_size, formatted)
+            else:
+                converted = [map(self._get_mapping_from_line if formatted else self._get_pair_from_line, ipa)]
+            self._write_orthography(path_out, converted, output_format, dict_name)
+
+    def _write_orthography(self, path_out, converted, output_format, dict_name):
+        """
+        Writes a series of converted lines to the output file in a given format.
+
+        :param path_out: The path of the output file.
+        :param converted: An iterable of chunks of converted lines, each line being a line of a Python dictionary
+            if the format is "python", or a tuple containing a word and its equivalent otherwise.
+        :param output_format: The format of the output file.
+        :param dict_name: The name of the output Python dictionary.
         """
+        if output_format != "python":
+            write_mapping(path_out, itertools.chain.from_iterable(converted), output_format, dict_name)
+            return
         with open(path_out, "w") as output:
             output.write(HEADER_FORMAT % dict_name)
-            with open(path_in, "r") as ipa:
-                for line in ipa.readlines():
-                    mapping = self._get_mapping_from_line(line)
-                    output.write(mapping)
+            for chunk in converted:
+                output.writelines(chunk)
             output.write(FOOTER_FORMAT)
 
+    def _convert_parallel(self, lines, workers, chunk_size, formatted):
+        """
+        Converts a series of lines into mappings using a pool of processes, keeping only a few chunks of lines in
+        flight at once.
+
+        :param lines: An iterable of the lines to be converted.
+        :param workers: The number of processes within the pool.
+        :param chunk_size: The number of lines within each chunk.
+        :param formatted: Whether each line is converted into a line of a Python dictionary rather than a tuple.
+        :return: A generator yielding a list of the converted lines of each chunk in order.
+        """
+        pending = deque()
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_initialize_worker,
+                                                    initargs=(self,)) as executor:
+            for chunk in iter(lambda: list(itertools.islice(lines, chunk_size)), []):
+                pending.append(executor.submit(_convert_lines, chunk, formatted))
+                if len(pending) > workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     def _get_mapping_from_line(self, line):
         """
         Given a line of text containing both a word and its pronunciation expressed in the International Phonetic
@@ -76,13 +160,30 @@ class Orthographer:
         :return: A line of text mapping a word to its equivalent in the given orthography within a Python
             dictionary.
         """
-        unzipped = re.split(self.delimiter, line)
-        old = unzipped[0]
-        ipa = unzipped[1].strip().translate(
-            {ord(i): None for i in self.removed}
-        )
-        new = self._ipa_to_new(ipa)
-        return self.mapping % (old, new)
+        return self.mapping % self._get_pair_from_line(line)
+
+    def _get_pair_from_line(self, line):
+        """
+        Given a line of text containing both a word and its pronunciation expressed in the International Phonetic
+        Alphabet (IPA), the word is paired with its equivalent in the given orthography. The dictionaries of sounds
+        are not checked for changes, as generate_orthography checks them once before converting any line.
+
+        :param line: The line of text to be converted.
+        :return: A tuple containing the word and its equivalent in the given orthography.
+        """
+        old, ipa = self._split_line(line)
+        return old, self.__convert(ipa)
+
+    def _split_line(self, line):
+        """
+        Separates a line of text into a word and its pronunciation expressed in the International Phonetic Alphabet
+        (IPA), removing the ignored characters from the pronunciation.
+
+        :param line: The line of text to be separated.
+        :return: A tuple containing the word and its pronunciation.
+        """
+        unzipped = self.__delimiter_pattern.split(line)
+        return unzipped[0], unzipped[1].strip().translate(self.__removed_table)
 
     def _ipa_to_new(self, ipa):
         """
@@ -93,21 +194,84 @@ class Orthographer:
         :return: A word written in the given orthography with a pronunciation equivalent to that of the given IPA
             characters.
         """
-        output = ""
-        index = 0
-        length = len(ipa)
-        while index < length:
-            increment = index + 1
-            head = ipa[index]
-            if increment == length or head + ipa[increment] not in self.from_ipa_two.keys():
-                output += self.from_ipa_one.setdefault(head, head)
-                index += 1
-            else:
-                tail = ipa[increment]
-                output += self.from_ipa_two[head + tail]
-                index += 2
+        self.__refresh_rules()
+        return self.__convert(ipa)
+
+    def __convert(self, ipa):
+        """
+        Converts a string of letters from the International Phonetic Alphabet (IPA) using the compiled rules, without
+        checking the dictionaries of sounds for changes.
 
-        return output
+        :param ipa: A string of letters from the IPA.
+        :return: A word written in the given orthography with a pronunciation equivalent to that of the given IPA
+            characters.
+        """
+        replace = self.__placeholders.__getitem__
+        return self.__sound_pattern.sub(lambda match: replace(match.group()), ipa).translate(self.__sound_table)
+
+    def _get_sounds(self, ipa):
+        """
+        Splits a string of letters from the International Phonetic Alphabet (IPA) into the sounds converted by the
+        given orthography, including any characters without an equivalent.
+
+        :param ipa: A string of letters from the IPA.
+        :return: A set of every sound within the string.
+        """
+        self.__refresh_rules()
+        replace = self.__placeholders.__getitem__
+        keys = self.__placeholder_keys
+        return {keys.get(char, char) for char in self.__sound_pattern.sub(lambda match: replace(match.group()), ipa)}
+
+    def __refresh_rules(self):
+        """
+        Compiles the dictionaries of sounds again if any of them has been edited in place since they were last
+        compiled.
+        """
+        if (self.from_ipa_one, self.from_ipa_two, self.rules or {}) != self.__sources:
+            self.__compile_rules()
+
+    def __compile_rules(self):
+        """
+        Merges every dictionary of sounds into a regex matching the longest sound of more than one character
+        beginning at a given position, and a translation table replacing each single character. As the output of one
+        sound may itself be a sound, each longer sound is first replaced by a placeholder from the Supplementary
+        Private Use Area, which never occurs within the IPA, and then translated alongside the single characters.
+        """
+        self.__sources = (dict(self.from_ipa_one), dict(self.from_ipa_two), dict(self.rules or {}))
+        sounds = {**self.from_ipa_one, **self.from_ipa_two, **(self.rules or {})}
+        keys = sorted((key for key in sounds if len(key) > 1), key=len, reverse=True)
+        self.__sounds = sounds
+        self.__placeholders = {key: chr(PLACEHOLDER_START + index) for index, key in enumerate(keys)}
+        self.__placeholder_keys = {value: key for key, value in self.__placeholders.items()}
+        self.__sound_table = {ord(key): value for key, value in sounds.items() if len(key) == 1}
+        self.__sound_table.update({ord(self.__placeholders[key]): sounds[key] for key in keys})
+        self.__sound_pattern = re.compile("|".join(re.escape(key) for key in keys) or "(?!)")
+
+
+_worker_orthographer = None
+
+
+def _initialize_worker(orthographer):
+    """
+    Stores the orthographer used by a worker process of a pool created by Orthographer.generate_orthography.
+
+    :param orthographer: The orthographer used to convert each line.
+    """
+    global _worker_orthographer
+    _worker_orthographer = orthographer
+
+
+def _convert_lines(lines, formatted):
+    """
+    Converts a chunk of lines into mappings within a worker process.
+
+    :param lines: A list of lines, each containing both a word and its pronunciation.
+    :param formatted: Whether each line is converted into a line of a Python dictionary rather than a tuple.
+    :return: A list of the mappings of every line.
+    """
+    if formatted:
+        return list(map(_worker_orthographer._get_mapping_from_line, lines))
+    return list(map(_worker_orthographer._get_pair_from_line, lines))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from collections.abc import MutableMapping
+import importlib
+import time
+
+
+class LazyMapping(MutableMapping):
+    """
+    A dictionary which defers importing the module containing it until it is first accessed, such that programs
+    which never translate a word never pay the cost of loading the mapping.
+
+    :param module: The name of the module containing the dictionary.
+    :param attribute: The name of the dictionary within the module.
+    """
+
+    def __init__(self, module, attribute="MAPPING"):
+        self.module = module
+        self.attribute = attribute
+        self.load_time = None
+        self._mapping = None
+
+    def __reduce__(self):
+        return type(self), (self.module, self.attribute)
+
+    @property
+    def loaded(self):
+        """
+        Whether the dictionary has been loaded.
+        """
+        return self._mapping is not None
+
+    def load(self):
+        """
+        Imports the dictionary if it has not yet been loaded, recording the number of seconds taken within the
+        load_time attribute.
+
+        :return: The loaded dictionary.
+        """
+        if self._mapping is None:
+            start = time.perf_counter()
+            self._mapping = getattr(importlib.import_module(self.module), self.attribute)
+            self.load_time = time.perf_counter() - start
+        return self._mapping
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __setitem__(self, key, value):
+        self.load()[key] = value
+
+    def __delitem__(self, key):
+        del self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __contains__(self, key):
+        return key in self.load()
+
+    def get(self, key, default=None):
+        """
+        Returns the value mapped to a given key if such a mapping exists. Otherwise, returns the given default.
+
+        :param key: The key to have its value returned.
+        :param default: The value returned if the key has no mapping.
+        :return: The value mapped to the given key, or the default.
+        """
+        return self.load().get(key, default)
+
+    def setdefault(self, key, default=None):
+        """
+        Returns the value mapped to a given key if such a mapping exists. Otherwise, maps the key to the given default
+        and returns it.
+
+        :param key: The key to have its value returned.
+        :param default: The value mapped to the key if it has no mapping.
+        :return: The value mapped to the given key.
+        """
+        return self.load().setdefault(key, default)
@@ -1,17 +1,18 @@
 # Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
 # Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
 
-from ipa_to_orthography import orthography
+from lazy_mapping import LazyMapping
 from translator import Translator
 
 
 INPUT = "in.txt"
 OUTPUT = "out.txt"
 FROM_PDF = False
+MAPPING_MODULE = "ipa_to_orthography.orthography"
 
 
 def main():
-    translate = Translator(orthography.MAPPING)
+    translate = Translator(LazyMapping(MAPPING_MODULE))
     translate.translate_file(INPUT, OUTPUT, FROM_PDF)
 
 
@@ -0,0 +1,109 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+import time
+
+
+STAGES = ("read", "tokenize", "lookup", "format", "write")
+
+
+class TranslationStats:
+    """
+    Collects the time spent within each stage of a single translation, alongside the number of words processed, the
+    number of words left unchanged by the mapping, and the size of the text entering and leaving the translator.
+    Stages processed by worker processes are summed across every process.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.tokens = 0
+        self.unknown = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def __repr__(self):
+        stages = ", ".join(f"{stage}={seconds:.6f}" for stage, seconds in self.seconds.items())
+        return f"{type(self).__name__}({stages}, tokens={self.tokens}, unknown={self.unknown}, " \
+               f"bytes_in={self.bytes_in}, bytes_out={self.bytes_out})"
+
+    @property
+    def total_seconds(self):
+        """
+        The time spent within every stage.
+        """
+        return sum(self.seconds.values())
+
+    def as_dict(self):
+        """
+        Returns every collected value.
+
+        :return: A dictionary containing the time spent within each stage and every counter.
+        """
+        return {
+            "seconds": dict(self.seconds),
+            "tokens": self.tokens,
+            "unknown": self.unknown,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+    def merge(self, other):
+        """
+        Adds the values collected by another instance, such as one filled within a worker process.
+
+        :param other: The instance to be merged.
+        """
+        for stage, seconds in other.seconds.items():
+            self.seconds[stage] += seconds
+        self.tokens += other.tokens
+        self.unknown += other.unknown
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+
+    def time(self, stage, function, *args):
+        """
+        Calls a given function, adding the time it takes to a given stage.
+
+        :param stage: The stage to which the time is added.
+        :param function: The function to be called.
+        :param args: The arguments passed to the function.
+        :return: The value returned by the function.
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+    def produced(self, stage, iterable):
+        """
+        Yields each item of a given iterable, adding the time taken to produce each item to a given stage.
+
+        :param stage: The stage to which the time is added.
+        :param iterable: The iterable to be measured.
+        :return: A generator yielding each item of the iterable.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.seconds[stage] += time.perf_counter() - start
+                return
+            self.seconds[stage] += time.perf_counter() - start
+            yield item
+
+    def written(self, chunks):
+        """
+        Yields each of a series of output chunks, counting their size and adding the time spent by the consumer on each
+        chunk, such as writing it to a file, to the write stage.
+
+        :param chunks: An iterable of the output chunks.
+        :return: A generator yielding each chunk.
+        """
+        for chunk in chunks:
+            self.bytes_out += len(chunk.encode("utf-8"))
+            start = time.perf_counter()
+            yield chunk
+            self.seconds["write"] += time.perf_counter() - start
@@ -1,8 +1,33 @@
 # Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
 # Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
 
-import pdfplumber
+from collections import deque
+from ipa_to_orthography.file_utils import save_atomically
+from translation_stats import TranslationStats
+from unknown_words import UnknownWords
+import base64
+import bz2
+import codecs
+import gzip
+import io
+import json
+import locale
+import lzma
+import mmap
+import os
 import re
+import time
+
+
+CHUNK_SIZE = 2 ** 20
+PIECE_SIZE = 2 ** 18
+PAGE_BATCH_SIZE = 16
+WRITE_BUFFER_SIZE = 2 ** 20
+CHECKPOINT_INTERVAL = 2 ** 26
+CHECKPOINT_OPTIONS = ("capitalize", "break_lines", "max_line_length", "delimiter", "stoppers", "specials")
+
+COMPRESSED_EXTENSIONS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+COMPRESSED_MAGIC = ((b"\x1f\x8b", gzip.open), (b"BZh", bz2.open), (b"\xfd7zXZ\x00", lzma.open))
 
 
 class Translator:
@@ -17,6 +42,13 @@ class Translator:
     :param stoppers: The text characters recognized as sentence stoppers within the output, formatted as a regex string.
     :param specials: The text characters recognized as punctuation marks but not sentence stoppers within the output,
         formatted as a regex string.
+    :param read_only: Whether the mapping will be left unmodified during translation. Words without a mapping are
+        then counted within the unknown_words attribute rather than being added to the mapping.
+    :param max_unknown: The maximum number of distinct words without a mapping counted at once in read-only mode.
+    :param instrument: Whether the time spent within each stage of each translation, alongside the number of words,
+        unknown words, and bytes processed, will be collected within the stats attribute.
+    :param on_stats: A function called with the collected stats at the end of each translation. Providing such a
+        function implies instrumentation.
     """
 
     def __init__(self, mapping,
@@ -25,9 +57,18 @@ class Translator:
                  max_line_length=100,
                  delimiter=" ",
                  stoppers=".!\?\n",
-                 specials="~@#\$%\^&\*/:;-_=\+"
+                 specials="~@#\$%\^&\*/:;-_=\+",
+                 read_only=False,
+                 max_unknown=10000,
+                 instrument=False,
+                 on_stats=None
                  ):
         self.mapping = mapping
+        self.read_only = read_only
+        self.unknown_words = UnknownWords(max_unknown) if read_only else None
+        self.instrument = instrument or on_stats is not None
+        self.on_stats = on_stats
+        self.stats = None
         self.capitalize = capitalize
         self.break_lines = break_lines
         self.max_line_length = max_line_length
@@ -36,6 +77,7 @@ class Translator:
         self.specials = specials
         self.__punctuation = stoppers + specials
         self.__kept_regex = r"[\w']+|[" + self.__punctuation + "]"
+        self.__kept_pattern = re.compile(self.__kept_regex)
 
     def __getattr__(self, item):
         if item == "stoppers" or item == "specials":
@@ -48,32 +90,328 @@ class Translator:
         if name == "stoppers" or name == "specials":
             self.__punctuation = self.stoppers + self.specials
             self.__kept_regex = r"[\w']+|[" + self.__punctuation + "]"
+            self.__kept_pattern = re.compile(self.__kept_regex)
 
-    def translate(self, text):
+    def translate(self, text, workers=1):
         """
         Replaces each word within the given text with its mapped counterpart and formats the output.
 
         :param text: The text to be translated.
+        :param workers: The number of processes among which the text is divided. The output is identical regardless
+            of the number of processes.
         :return: The translated text.
         """
-        return self._process_text(text)
+        stats = self._start_stats()
+        if workers > 1:
+            chunks = (text[index:index + PIECE_SIZE] for index in range(0, len(text), PIECE_SIZE))
+            output = "".join(self._strip_stream(self._process_parallel(chunks, workers)))
+        else:
+            output = self._process_text(text)
+        if stats is not None:
+            stats.bytes_out += len(output.encode("utf-8"))
+        self._finish_stats()
+        return output
+
+    def translate_many(self, texts, deduplicate=False, workers=1, batch_size=None):
+        """
+        Replaces each word within each of a series of texts with its mapped counterpart and formats each output. The
+        setup shared by each translation is performed only once, such that many short texts may be translated
+        quickly.
 
-    def translate_file(self, input_path, output_path=None, from_pdf=False):
+        :param texts: An iterable of the texts to be translated.
+        :param deduplicate: Whether identical texts will be translated only once.
+        :param workers: The number of processes among which the texts are divided.
+        :param batch_size: The number of texts sent to a process at a time. If none is provided, the texts are
+            divided evenly among four batches per process.
+        :return: A list of the translated texts, in the order of the given texts.
+        """
+        import concurrent.futures
+        stats = self._start_stats()
+        texts = list(texts)
+        unique = list(dict.fromkeys(texts)) if deduplicate else texts
+        if workers > 1 and unique:
+            batch_size = batch_size or -(-len(unique) // (workers * 4))
+            batches = [unique[index:index + batch_size] for index in range(0, len(unique), batch_size)]
+            translated = []
+            with concurrent.futures.ProcessPoolExecutor(workers, initializer=_initialize_worker,
+                                                        initargs=(self,)) as executor:
+                for outputs, unknown, worker_stats in executor.map(_translate_batch, batches):
+                    translated.extend(outputs)
+                    if self.read_only:
+                        self.unknown_words.update(unknown)
+                    if stats is not None:
+                        stats.merge(worker_stats)
+        else:
+            translated = self._translate_batch(unique)
+        if deduplicate:
+            lookup = dict(zip(unique, translated))
+            translated = [lookup[text] for text in texts]
+        if stats is not None:
+            stats.bytes_out += sum(len(output.encode("utf-8")) for output in translated)
+        self._finish_stats()
+        return translated
+
+    def translate_file(self, input_path, output_path=None, from_pdf=False, stream=False, chunk_size=CHUNK_SIZE,
+                       workers=1, pages=None, pdf_workers=1, cache=None, memory_map=False, checkpoint=None,
+                       checkpoint_interval=CHECKPOINT_INTERVAL):
         """
         Replaces each word within the text from a given TXT or PDF file with its mapped counterpart, formats the
         output, and saves it to a given TXT file.
 
-        :param input_path: The path to a TXT or PDF file containing the text to be converted.
-        :param output_path: The path to a TXT file to which the output will be saved.
+        :param input_path: The path to a TXT or PDF file containing the text to be converted. TXT files compressed with
+            gzip, bzip2, or xz are decompressed as they are read.
+        :param output_path: The path to a TXT file to which the output will be saved. Paths ending in .gz, .bz2, or .xz
+            are compressed as they are written.
         :param from_pdf: Whether the input file is a PDF file.
+        :param stream: Whether the text will be read, processed, and written in chunks rather than all at once, one
+            page at a time for PDF files. The output is identical in either case.
+        :param chunk_size: The number of characters read from the input file at a time while streaming.
+        :param workers: The number of processes among which the text is divided. Multiple processes imply streaming.
+        :param pages: The numbers of the pages read from the PDF file, starting from one. The pages are read in the
+            order of the file, and numbers outside of the file are skipped. If none are provided, every page is read.
+        :param pdf_workers: The number of processes among which the pages of the PDF file are divided for extraction.
+        :param cache: An ExtractionCache from which the text of each page of the PDF file is read if it was extracted
+            previously, and to which the text of each newly extracted page is saved.
+        :param memory_map: Whether the TXT file will be memory-mapped and decoded in blocks of chunk_size bytes rather
+            than read through a file object. Memory-mapping implies streaming, and is skipped for compressed files.
+        :param checkpoint: The path of a file to which the progress of the translation is periodically saved. If the
+            file exists, the translation resumes from the saved progress, producing the same output as an
+            uninterrupted translation. The file is removed once the translation is complete. Checkpointing implies
+            streaming, and requires an uncompressed TXT input file and an uncompressed output path.
+        :param checkpoint_interval: The number of bytes of the input file read between each checkpoint.
         :return: If no output path is provided, the processed text will be directly returned.
         """
-        read = self._read_pdf if from_pdf else self._read_txt
-        unprocessed = read(input_path)
+        stats = self._start_stats()
+        if checkpoint is not None:
+            if from_pdf or output_path is None or self._is_compressed(input_path) or \
+                    os.path.splitext(output_path)[1].lower() in COMPRESSED_EXTENSIONS:
+                raise ValueError("Checkpointing requires uncompressed TXT input and output files.")
+            self._translate_checkpointed(input_path, output_path, checkpoint, chunk_size, checkpoint_interval)
+            self._finish_stats()
+            return
+        if stream or workers > 1 or memory_map:
+            if from_pdf:
+                chunks = self._iter_pdf(input_path, pages, pdf_workers, cache)
+            elif memory_map and not self._is_compressed(input_path):
+                chunks = self._iter_txt_mapped(input_path, chunk_size)
+            else:
+                chunks = self._iter_txt(input_path, chunk_size)
+            if stats is not None:
+                chunks = stats.produced("read", chunks)
+            if workers > 1:
+                processed = self._strip_stream(self._process_parallel(chunks, workers))
+            else:
+                processed = self._stream_text(chunks)
+            if stats is not None:
+                processed = stats.written(processed)
+            if output_path is None:
+                processed = "".join(processed)
+                self._finish_stats()
+                return processed
+            self._write_chunks(output_path, processed)
+            self._finish_stats()
+            return
+        if from_pdf:
+            unprocessed = self._measure("read", self._read_pdf, input_path, pages, pdf_workers, cache)
+        else:
+            unprocessed = self._measure("read", self._read_txt, input_path)
         processed = self._process_text(unprocessed)
+        if stats is not None:
+            stats.bytes_out += len(processed.encode("utf-8"))
         if output_path is None:
+            self._finish_stats()
             return processed
-        self._write_txt(output_path, processed)
+        self._measure("write", self._write_txt, output_path, processed)
+        self._finish_stats()
+
+    def translate_stream(self, reader, writer, chunk_size=CHUNK_SIZE, workers=1, buffer_size=WRITE_BUFFER_SIZE):
+        """
+        Replaces each word within the text read from a given file object with its mapped counterpart, formats the
+        output, and writes it to another file object as the text is read. Any text file object may be used, such as
+        standard input and output, pipes, or sockets opened as files.
+
+        :param reader: The text file object from which the text is read.
+        :param writer: The text file object to which the output is written.
+        :param chunk_size: The number of characters read at a time.
+        :param workers: The number of processes among which the text is divided.
+        :param buffer_size: The number of characters of output collected before each write.
+        """
+        stats = self._start_stats()
+        chunks = iter(lambda: reader.read(chunk_size), "")
+        if stats is not None:
+            chunks = stats.produced("read", chunks)
+        if workers > 1:
+            processed = self._strip_stream(self._process_parallel(chunks, workers))
+        else:
+            processed = self._stream_text(chunks)
+        if stats is not None:
+            processed = stats.written(processed)
+        self._write_buffered(writer, processed, buffer_size)
+        self._finish_stats()
+
+    def _translate_checkpointed(self, input_path, output_path, checkpoint, block_size, interval):
+        """
+        Translates a TXT file one block of bytes at a time, periodically saving the position within the input file,
+        the size of the output file, and the formatting state to a checkpoint file. Each checkpoint is saved only
+        once the output preceding it is flushed to disk. If the checkpoint file exists, matches the input file, the
+        output file, and the formatting options, and the output file still holds the output it records, the
+        translation resumes from it; otherwise the translation starts over.
+
+        :param input_path: The path of the TXT file containing the text to be converted.
+        :param output_path: The path of the TXT file to which the output will be saved.
+        :param checkpoint: The path of the checkpoint file.
+        :param block_size: The number of bytes read from the input file at a time.
+        :param interval: The number of bytes read between each checkpoint.
+        """
+        status = os.stat(input_path)
+        source = {
+            "path": os.path.abspath(input_path),
+            "size": status.st_size,
+            "mtime": status.st_mtime_ns,
+            "output": os.path.abspath(output_path),
+            "options": {option: getattr(self, option) for option in CHECKPOINT_OPTIONS},
+        }
+        state = self._load_checkpoint(checkpoint, source)
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(locale.getpreferredencoding(False))(),
+                                               translate=True)
+        if state is None:
+            state = {"input": 0, "output": 0, "decoder": ["", 0], "carried": "", "previous": "", "line_length": 0,
+                     "started": False, "pending": ""}
+            open(output_path, "w").close()
+        else:
+            with open(output_path, "r+b") as opened:
+                opened.truncate(state["output"])
+        decoder.setstate((base64.b64decode(state["decoder"][0]), state["decoder"][1]))
+        stats = self.stats
+        carried = state["carried"]
+        previous = state["previous"]
+        line_length = state["line_length"]
+        started = state["started"]
+        pending = state["pending"]
+        with open(input_path, "rb") as reader, open(output_path, "a") as writer:
+            reader.seek(state["input"])
+            unsaved = 0
+            while True:
+                start = time.perf_counter()
+                block = reader.read(block_size)
+                text = carried + decoder.decode(block, final=not block)
+                if stats is not None:
+                    stats.seconds["read"] += time.perf_counter() - start
+                index = len(text) if not block else self._word_border(text)
+                carried = text[index:]
+                parts, previous, line_length = self._process_chunk(text[:index], previous, line_length)
+                output, started, pending = self._strip_output("".join(parts), started, pending)
+                if stats is None:
+                    writer.write(output)
+                else:
+                    stats.bytes_out += len(output.encode("utf-8"))
+                    stats.time("write", writer.write, output)
+                if not block:
+                    break
+                unsaved += len(block)
+                if unsaved >= interval:
+                    writer.flush()
+                    os.fsync(writer.fileno())
+                    buffered, flag = decoder.getstate()
+                    self._save_checkpoint(checkpoint, {
+                        "source": source, "input": reader.tell(), "output": writer.buffer.tell(),
+                        "decoder": [base64.b64encode(buffered).decode("ascii"), flag], "carried": carried,
+                        "previous": previous, "line_length": line_length, "started": started, "pending": pending,
+                    })
+                    unsaved = 0
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+    @staticmethod
+    def _load_checkpoint(checkpoint, source):
+        """
+        Reads a checkpoint file if it exists, was saved while translating a given input file to a given output file
+        with the same formatting options, and the output file still holds at least the output it records.
+
+        :param checkpoint: The path of the checkpoint file.
+        :param source: A dictionary identifying the input file by its path, size, and modification time, alongside
+            the path of the output file and the formatting options.
+        :return: A dictionary containing the saved progress, or None if there is none to resume from.
+        """
+        if not os.path.exists(checkpoint):
+            return None
+        with open(checkpoint, "r") as opened:
+            state = json.load(opened)
+        if state.get("source") != source or not os.path.exists(source["output"]):
+            return None
+        return state if os.path.getsize(source["output"]) >= state["output"] else None
+
+    @staticmethod
+    def _save_checkpoint(checkpoint, state):
+        """
+        Overwrites a checkpoint file.
+
+        :param checkpoint: The path of the checkpoint file.
+        :param state: A dictionary containing the progress to be saved.
+        """
+        save_atomically(checkpoint, lambda opened: json.dump(state, opened))
+
+    def _start_stats(self):
+        """
+        Replaces the stats attribute with an empty instance if instrumentation is enabled.
+
+        :return: The new stats, or None if instrumentation is disabled.
+        """
+        self.stats = TranslationStats() if self.instrument else None
+        return self.stats
+
+    def _finish_stats(self):
+        """
+        Passes the collected stats to the on_stats function, if both exist.
+        """
+        if self.stats is not None and self.on_stats is not None:
+            self.on_stats(self.stats)
+
+    def _measure(self, stage, function, *args):
+        """
+        Calls a given function, adding the time it takes to a given stage if instrumentation is enabled.
+
+        :param stage: The stage to which the time is added.
+        :param function: The function to be called.
+        :param args: The arguments passed to the function.
+        :return: The value returned by the function.
+        """
+        if self.stats is None:
+            return function(*args)
+        return self.stats.time(stage, function, *args)
+
+    @staticmethod
+    def _open_txt(file, mode):
+        """
+        Opens a given TXT file in text mode, decompressing or compressing it if it is compressed. Files being read are
+        recognized by their leading bytes, while files being written are recognized by their extension.
+
+        :param file: The path of the file.
+        :param mode: The mode in which the file is opened, either "r" or "w".
+        :return: The opened file object.
+        """
+        if mode == "r":
+            opener = Translator._is_compressed(file)
+        else:
+            opener = COMPRESSED_EXTENSIONS.get(os.path.splitext(file)[1].lower())
+        if opener is None:
+            return open(file, mode)
+        return opener(file, mode + "t")
+
+    @staticmethod
+    def _is_compressed(file):
+        """
+        Checks whether a given file is compressed with gzip, bzip2, or xz according to its leading bytes.
+
+        :param file: The path of the file.
+        :return: The function opening the file if it is compressed, or None otherwise.
+        """
+        with open(file, "rb") as opened:
+            head = opened.read(6)
+        for magic, opener in COMPRESSED_MAGIC:
+            if head.startswith(magic):
+                return opener
+        return None
 
     @staticmethod
     def _read_txt(file):
@@ -83,11 +421,115 @@ class Translator:
         :param file: The path of the file.
         :return: The text of the file.
         """
-        output = ""
-        with open(file, "r") as opened:
-            for line in opened.readlines():
-                output += line
-        return output
+        with Translator._open_txt(file, "r") as opened:
+            return opened.read()
+
+    @staticmethod
+    def _iter_txt(file, chunk_size):
+        """
+        Reads the text of a given TXT file one chunk at a time.
+
+        :param file: The path of the file.
+        :param chunk_size: The maximum number of characters within each chunk.
+        :return: A generator yielding each chunk of the text of the file.
+        """
+        with Translator._open_txt(file, "r") as opened:
+            for chunk in iter(lambda: opened.read(chunk_size), ""):
+                yield chunk
+
+    @staticmethod
+    def _iter_pdf_cached(file, pages, workers, cache):
+        """
+        Reads the text of a given PDF file one page at a time, reading each previously extracted page from a cache and
+        extracting only the remaining pages, each of which is then saved to the cache.
+
+        :param file: The path of the file.
+        :param pages: The sorted numbers of the pages to be read, starting from one. If none are provided, every page
+            is read.
+        :param workers: The number of processes among which the extracted pages are divided.
+        :param cache: An ExtractionCache storing the text of previously extracted pages.
+        :return: A generator yielding the text of each page of the file.
+        """
+        import pdfplumber
+        file_hash = cache.hash_file(file)
+        page_count = cache.get_page_count(file_hash)
+        if page_count is None:
+            with pdfplumber.open(file) as pdf:
+                page_count = len(pdf.pages)
+            cache.put_page_count(file_hash, page_count)
+        if pages is None:
+            pages = range(1, page_count + 1)
+        pages = [page for page in pages if page <= page_count]
+        missing = [page for page in pages if (file_hash, page) not in cache]
+        extracted = zip(missing, Translator._iter_pdf(file, missing, workers)) if missing else iter(())
+        missing = set(missing)
+        for page in pages:
+            if page in missing:
+                page, text = next(extracted)
+                cache.put(file_hash, page, text)
+            else:
+                text = cache.get(file_hash, page)
+                if text is None:
+                    text = "".join(Translator._iter_pdf(file, [page]))
+                    cache.put(file_hash, page, text)
+            yield text
+
+    @staticmethod
+    def _iter_pdf_parallel(file, pages, workers):
+        """
+        Reads the text of a given PDF file using a pool of processes, each of which opens the file itself and extracts
+        a batch of pages at a time. The text of each page is yielded in order.
+
+        :param file: The path of the file.
+        :param pages: The sorted numbers of the pages to be read, starting from one. If none are provided, every page
+            is read.
+        :param workers: The number of processes within the pool.
+        :return: A generator yielding the text of each page of the file.
+        """
+        import concurrent.futures
+        import pdfplumber
+        if pages is None:
+            with pdfplumber.open(file) as pdf:
+                pages = range(1, len(pdf.pages) + 1)
+        pages = list(pages)
+        pending = deque()
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            for index in range(0, len(pages), PAGE_BATCH_SIZE):
+                pending.append(executor.submit(_extract_pages, file, pages[index:index + PAGE_BATCH_SIZE]))
+                if len(pending) > workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    @staticmethod
+    def _iter_txt_mapped(file, block_size, encoding=None):
+        """
+        Reads the text of a given TXT file by memory-mapping it and decoding one block at a time. Characters split
+        across the border between two blocks are decoded once the second block is read, and newlines are translated
+        as they would be by a file object.
+
+        :param file: The path of the file.
+        :param block_size: The number of bytes decoded at a time.
+        :param encoding: The encoding of the file. If none is provided, the encoding used by open is assumed.
+        :return: A generator yielding each decoded block of the text of the file.
+        """
+        decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))()
+        decoder = io.IncrementalNewlineDecoder(decoder, translate=True)
+        with open(file, "rb") as opened:
+            if os.fstat(opened.fileno()).st_size == 0:
+                return
+            with mmap.mmap(opened.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, len(mapped), block_size):
+                        text = decoder.decode(view[start:start + block_size])
+                        if text:
+                            yield text
+                finally:
+                    view.release()
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
 
     @staticmethod
     def _write_txt(file, text):
@@ -97,22 +539,89 @@ class Translator:
         :param file: The path of the file.
         :param text: The text to be written.
         """
-        with open(file, "w") as opened:
+        with Translator._open_txt(file, "w") as opened:
             opened.write(text)
 
     @staticmethod
-    def _read_pdf(file):
+    def _write_chunks(file, chunks):
+        """
+        Overwrites the contents of a given TXT file with a series of chunks of text.
+
+        :param file: The path of the file.
+        :param chunks: An iterable of the chunks of text to be written.
+        """
+        with Translator._open_txt(file, "w") as opened:
+            for chunk in chunks:
+                opened.write(chunk)
+
+    @staticmethod
+    def _write_buffered(writer, chunks, buffer_size):
+        """
+        Writes a series of chunks of text to a given file object, joining small chunks such that each write contains
+        at least a given number of characters, then flushes the file object.
+
+        :param writer: The text file object to which the text is written.
+        :param chunks: An iterable of the chunks of text to be written.
+        :param buffer_size: The minimum number of characters within each write, excluding the last.
+        """
+        buffered = []
+        length = 0
+        for chunk in chunks:
+            buffered.append(chunk)
+            length += len(chunk)
+            if length >= buffer_size:
+                writer.write("".join(buffered))
+                buffered = []
+                length = 0
+        if buffered:
+            writer.write("".join(buffered))
+        if hasattr(writer, "flush"):
+            writer.flush()
+
+    @staticmethod
+    def _read_pdf(file, pages=None, workers=1, cache=None):
         """
-        Reads the text of a given PDF file.
+        Reads the text of a given PDF file. The pdfplumber module is only imported once a PDF file is read, such that
+        translating plain text never pays the cost of importing it.
 
         :param file: The path of the file.
+        :param pages: The numbers of the pages to be read, starting from one. If none are provided, every page is read.
+        :param workers: The number of processes among which the pages are divided.
+        :param cache: An ExtractionCache storing the text of previously extracted pages.
         :return: The text of the file.
         """
-        output = ""
-        with pdfplumber.open(file) as pdf:
+        return "".join(Translator._iter_pdf(file, pages, workers, cache))
+
+    @staticmethod
+    def _iter_pdf(file, pages=None, workers=1, cache=None):
+        """
+        Reads the text of a given PDF file one page at a time, releasing the cached contents of each page once its
+        text is extracted.
+
+        :param file: The path of the file.
+        :param pages: The numbers of the pages to be read, starting from one. The pages are read in the order of the
+            file, and numbers outside of the file are skipped. If none are provided, every page is read.
+        :param workers: The number of processes among which the pages are divided.
+        :param cache: An ExtractionCache storing the text of previously extracted pages.
+        :return: A generator yielding the text of each page of the file.
+        """
+        import pdfplumber
+        if pages is not None:
+            pages = sorted({page for page in pages if page >= 1})
+        if cache is not None:
+            yield from Translator._iter_pdf_cached(file, pages, workers, cache)
+            return
+        if workers > 1:
+            yield from Translator._iter_pdf_parallel(file, pages, workers)
+            return
+        with pdfplumber.open(file, pages=pages) as pdf:
             for page in pdf.pages:
-                output += page.extract_text() + "\n\n"
-        return output
+                text = page.extract_text() + "\n\n"
+                if hasattr(page, "close"):
+                    page.close()
+                else:
+                    page.flush_cache()
+                yield text
 
     def _process_text(self, text):
         """
@@ -122,18 +631,320 @@ class Translator:
         :param text: The text to be processed and formatted.
         :return: The processed and formatted text.
         """
-        output = ""
+        parts, _, _ = self._process_chunk(text, "", 0)
+        return self._join_stripped(parts)
+
+    def _stream_text(self, chunks):
+        """
+        Replaces each word within a series of chunks of text with its mapped counterpart, then formats and yields the
+        output incrementally. The formatting state is carried across the borders between chunks, such that the
+        joined output is identical to that of processing the entire text at once.
+
+        :param chunks: An iterable of the chunks of text to be processed and formatted.
+        :return: A generator yielding the processed and formatted text.
+        """
+        return self._strip_stream(self._process_chunks(self._split_chunks(chunks)))
+
+    def _process_chunks(self, chunks):
+        """
+        Replaces each word within a series of chunks of text with its mapped counterpart, carrying the formatting
+        state from each chunk to the next, and yields the unstripped output of each chunk.
+
+        :param chunks: An iterable of the chunks of text, none of which splits a word.
+        :return: A generator yielding the processed and formatted text of each chunk.
+        """
         previous = ""
         line_length = 0
-        for word in (word.lower() for word in re.findall(self.__kept_regex, text)):
-            phonetic = self._get_mapped_word(word)
-            formatted = self._format_word(phonetic, previous, line_length)
+        for chunk in chunks:
+            parts, previous, line_length = self._process_chunk(chunk, previous, line_length)
+            yield "".join(parts)
+
+    def _process_parallel(self, chunks, workers):
+        """
+        Replaces each word within a series of chunks of text with its mapped counterpart using a pool of processes,
+        and yields the unstripped output of each piece of text in order. The text is divided into pieces ending on a
+        newline, after which the formatting state is reset, such that each piece may be processed independently. Any
+        piece processed from a formatting state other than that left by the preceding piece is processed again.
+
+        :param chunks: An iterable of the chunks of text to be processed and formatted.
+        :param workers: The number of processes within the pool.
+        :return: A generator yielding the processed and formatted text of each piece.
+        """
+        import concurrent.futures
+        previous = ""
+        line_length = 0
+        assumed = ("", 0)
+        pending = deque()
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_initialize_worker,
+                                                    initargs=(self,)) as executor:
+            for piece in self._split_lines(chunks, PIECE_SIZE):
+                pending.append((piece, assumed, executor.submit(_process_piece, piece, *assumed)))
+                assumed = ("\n", 0)
+                if len(pending) > workers * 2:
+                    output, previous, line_length = self._stitch_piece(pending.popleft(), previous, line_length)
+                    yield output
+            while pending:
+                output, previous, line_length = self._stitch_piece(pending.popleft(), previous, line_length)
+                yield output
+
+    def _stitch_piece(self, entry, previous, line_length):
+        """
+        Collects the output of a piece of text processed by a worker process, processing the piece again if the
+        formatting state it was processed from differs from that left by the preceding piece.
+
+        :param entry: A tuple containing the piece of text, the formatting state it was processed from, and the
+            future holding its output.
+        :param previous: The final formatted word of the preceding piece.
+        :param line_length: The length of the current line within the output at the end of the preceding piece.
+        :return: The processed and formatted piece, followed by the final formatted word and the line length left
+            at its end.
+        """
+        piece, assumed, future = entry
+        output, end_previous, end_line_length, unknown, stats = future.result()
+        if assumed != (previous, line_length):
+            parts, end_previous, end_line_length = self._process_chunk(piece, previous, line_length)
+            return "".join(parts), end_previous, end_line_length
+        if self.read_only:
+            self.unknown_words.update(unknown)
+        if self.stats is not None:
+            self.stats.merge(stats)
+        return output, end_previous, end_line_length
+
+    def _translate_batch(self, texts):
+        """
+        Replaces each word within each of a series of texts with its mapped counterpart and formats each output.
+
+        The attributes and methods used for each word are looked up once per batch rather than once per text, and the
+        mapping and formatting of each word are performed inline. Instrumented translations are processed one text at
+        a time by _process_chunk, such that the time spent within each stage is still measured.
+
+        :param texts: A list of the texts to be processed and formatted.
+        :return: A list of the processed and formatted texts.
+        """
+        if self.stats is not None:
+            process_chunk = self._process_chunk
+            join_stripped = self._join_stripped
+            return [join_stripped(process_chunk(text, "", 0)[0]) for text in texts]
+        findall = self.__kept_pattern.findall
+        punctuation = self.__punctuation
+        read_only = self.read_only
+        get_mapped = self.mapping.get if read_only else self.mapping.setdefault
+        add_unknown = self.unknown_words.add if read_only else None
+        capitalize = self.capitalize
+        break_lines = self.break_lines
+        max_line_length = self.max_line_length
+        delimiter = self.delimiter
+        stoppers = self.stoppers
+        specials = self.specials
+        outputs = []
+        for text in texts:
+            parts = []
+            append = parts.append
+            previous = ""
+            line_length = 0
+            for word in findall(text):
+                word = word.lower()
+                if read_only:
+                    mapped = get_mapped(word)
+                    if mapped is None:
+                        if word not in punctuation:
+                            add_unknown(word)
+                        mapped = word
+                else:
+                    mapped = get_mapped(word, word)
+                formatted = mapped
+                if capitalize and previous == "" or previous in stoppers:
+                    formatted = formatted.capitalize()
+                if previous not in specials and mapped not in punctuation:
+                    if break_lines and line_length >= max_line_length:
+                        formatted = "\n" + formatted
+                    elif line_length > 0:
+                        formatted = delimiter + formatted
+                if formatted[0] == "\n":
+                    line_length = -1
+                line_length += len(formatted)
+                append(formatted)
+                previous = formatted
+            outputs.append("".join(parts).strip())
+        return outputs
+
+    @staticmethod
+    def _strip_stream(outputs):
+        """
+        Removes the leading and trailing whitespace from a series of pieces of text as though they were joined,
+        withholding whitespace at the end of each piece until further text follows it.
+
+        :param outputs: An iterable of the pieces of text.
+        :return: A generator yielding the stripped text.
+        """
+        started = False
+        pending = ""
+        for output in outputs:
+            output, started, pending = Translator._strip_output(output, started, pending)
+            if output:
+                yield output
+
+    @staticmethod
+    def _strip_output(output, started, pending):
+        """
+        Removes the leading and trailing whitespace from a single piece of text within a series, as performed by
+        _strip_stream.
+
+        :param output: The piece of text.
+        :param started: Whether any text other than whitespace preceded the piece.
+        :param pending: The whitespace withheld from the end of the preceding pieces.
+        :return: The text to be output, followed by whether any text other than whitespace has been output and the
+            whitespace withheld from the end of the piece.
+        """
+        if not started:
+            output = output.lstrip()
+            started = bool(output)
+        body = output.rstrip()
+        if body:
+            return pending + body, started, output[len(body):]
+        return "", started, pending + output
+
+    @staticmethod
+    def _join_stripped(parts):
+        """
+        Joins a series of formatted words into a single string without any leading or trailing whitespace, copying
+        the output only once.
+
+        :param parts: A list of the formatted words to be joined.
+        :return: The joined and stripped text.
+        """
+        start = 0
+        end = len(parts)
+        while start < end and (not parts[start] or parts[start].isspace()):
+            start += 1
+        while end > start and (not parts[end - 1] or parts[end - 1].isspace()):
+            end -= 1
+        if start == end:
+            return ""
+        parts[start] = parts[start].lstrip()
+        parts[end - 1] = parts[end - 1].rstrip()
+        return "".join(parts[start:end])
+
+    @staticmethod
+    def _split_lines(chunks, size):
+        """
+        Joins a series of chunks of text into pieces of at least a given size, each ending on a newline where
+        possible.
+
+        :param chunks: An iterable of the chunks of text.
+        :param size: The minimum number of characters within each piece.
+        :return: A generator yielding each piece of text.
+        """
+        buffered = []
+        length = 0
+        for chunk in chunks:
+            length += len(chunk)
+            index = chunk.rfind("\n") + 1
+            if length < size or not index:
+                buffered.append(chunk)
+                continue
+            buffered.append(chunk[:index])
+            yield "".join(buffered)
+            buffered = [chunk[index:]]
+            length = len(chunk) - index
+        if length:
+            yield "".join(buffered)
+
+    @staticmethod
+    def _split_chunks(chunks):
+        """
+        Shifts the borders between a series of chunks of text such that no word is split across two chunks.
+
+        :param chunks: An iterable of the chunks of text.
+        :return: A generator yielding each chunk of text, ending on a character which cannot be part of a word.
+        """
+        carried = ""
+        for chunk in chunks:
+            text = carried + chunk
+            index = Translator._word_border(text)
+            carried = text[index:]
+            if index:
+                yield text[:index]
+        if carried:
+            yield carried
+
+    @staticmethod
+    def _word_border(text):
+        """
+        Finds the last position within a given piece of text at which it may be split without splitting a word.
+
+        :param text: The text to be split.
+        :return: The index following the last character which cannot be part of a word, or zero if there is none.
+        """
+        index = len(text)
+        while index and (text[index - 1].isalnum() or text[index - 1] in "_'"):
+            index -= 1
+        return index
+
+    def _process_chunk(self, text, previous, line_length):
+        """
+        Replaces each word within a chunk of text with its mapped counterpart, then formats the output according to
+        the formatting state left by the preceding chunk.
+
+        :param text: The chunk of text to be processed and formatted.
+        :param previous: The final formatted word of the preceding chunk.
+        :param line_length: The length of the current line within the output at the end of the preceding chunk.
+        :return: A list of the formatted words of the chunk, followed by the final formatted word and the line length
+            left at its end.
+        """
+        if self.stats is not None:
+            return self._process_chunk_instrumented(text, previous, line_length)
+        parts = []
+        append = parts.append
+        get_mapped_word = self._get_mapped_word
+        format_word = self._format_word
+        for word in self.__kept_pattern.findall(text):
+            formatted = format_word(get_mapped_word(word.lower()), previous, line_length)
+            if formatted[0] == "\n":
+                line_length = -1
+            line_length += len(formatted)
+            append(formatted)
+            previous = formatted
+        return parts, previous, line_length
+
+    def _process_chunk_instrumented(self, text, previous, line_length):
+        """
+        Performs the same processing as _process_chunk, but tokenizes, maps, and formats the chunk in separate passes
+        such that the time spent within each stage may be measured.
+
+        :param text: The chunk of text to be processed and formatted.
+        :param previous: The final formatted word of the preceding chunk.
+        :param line_length: The length of the current line within the output at the end of the preceding chunk.
+        :return: A list of the formatted words of the chunk, followed by the final formatted word and the line length
+            left at its end.
+        """
+        stats = self.stats
+        start = time.perf_counter()
+        words = [word.lower() for word in self.__kept_pattern.findall(text)]
+        tokenized = time.perf_counter()
+        punctuation = self.__punctuation
+        get_mapped_word = self._get_mapped_word
+        mapped = []
+        for word in words:
+            replacement = get_mapped_word(word)
+            if replacement == word and word not in punctuation:
+                stats.unknown += 1
+            mapped.append(replacement)
+        looked_up = time.perf_counter()
+        parts = []
+        for word in mapped:
+            formatted = self._format_word(word, previous, line_length)
             if formatted[0] == "\n":
                 line_length = -1
             line_length += len(formatted)
-            output += formatted
+            parts.append(formatted)
             previous = formatted
-        return output.strip()
+        stats.seconds["tokenize"] += tokenized - start
+        stats.seconds["lookup"] += looked_up - tokenized
+        stats.seconds["format"] += time.perf_counter() - looked_up
+        stats.tokens += len(words)
+        stats.bytes_in += len(text.encode("utf-8"))
+        return parts, previous, line_length
 
     def _get_mapped_word(self, word):
         """
@@ -142,7 +953,14 @@ class Translator:
         :param word: The word to have its mapping returned.
         :return: The word mapped to the given word.
         """
-        return self.mapping.setdefault(word, word)
+        if not self.read_only:
+            return self.mapping.setdefault(word, word)
+        mapped = self.mapping.get(word)
+        if mapped is None:
+            if word not in self.__punctuation:
+                self.unknown_words.add(word)
+            return word
+        return mapped
 
     def _format_word(self, word, previous, line_length):
         """
@@ -162,3 +980,82 @@ class Translator:
             elif line_length > 0:
                 output = self.delimiter + output
         return output
+
+
+_worker_translator = None
+_worker_pdf = None
+
+
+def _initialize_worker(translator):
+    """
+    Stores the translator used by a worker process of a pool created by a Translator.
+
+    :param translator: The translator used to process each piece of text.
+    """
+    global _worker_translator
+    _worker_translator = translator
+
+
+def _process_piece(text, previous, line_length):
+    """
+    Processes a piece of text within a worker process of a pool created by Translator._process_parallel.
+
+    :param text: The piece of text to be processed and formatted.
+    :param previous: The final formatted word assumed to precede the piece.
+    :param line_length: The line length assumed at the start of the piece.
+    :return: The processed and formatted piece, the final formatted word and line length left at its end, the
+        counts of the words without a mapping found within the piece, and the stats collected while processing it.
+    """
+    unknown = _worker_translator.unknown_words
+    if unknown is not None:
+        unknown.clear()
+    stats = _worker_translator._start_stats()
+    parts, previous, line_length = _worker_translator._process_chunk(text, previous, line_length)
+    counts = unknown.most_common() if unknown is not None else []
+    return "".join(parts), previous, line_length, counts, stats
+
+
+def _translate_batch(texts):
+    """
+    Translates a batch of texts within a worker process of a pool created by Translator.translate_many.
+
+    :param texts: A list of the texts to be translated.
+    :return: A list of the translated texts, the counts of the words without a mapping found within them, and the
+        stats collected while translating them.
+    """
+    unknown = _worker_translator.unknown_words
+    if unknown is not None:
+        unknown.clear()
+    stats = _worker_translator._start_stats()
+    outputs = _worker_translator._translate_batch(texts)
+    return outputs, unknown.most_common() if unknown is not None else [], stats
+
+
+def _extract_pages(file, numbers):
+    """
+    Extracts the text of a batch of pages of a PDF file within a worker process of a pool created by
+    Translator._iter_pdf_parallel. The file is kept open between batches.
+
+    :param file: The path of the file.
+    :param numbers: The sorted numbers of the pages to be read, starting from one. Numbers past the end of the file
+        are skipped.
+    :return: A list containing the text of each page.
+    """
+    global _worker_pdf
+    import pdfplumber
+    if _worker_pdf is None or _worker_pdf[0] != file:
+        if _worker_pdf is not None:
+            _worker_pdf[1].close()
+        _worker_pdf = (file, pdfplumber.open(file))
+    pdf = _worker_pdf[1]
+    texts = []
+    for number in numbers:
+        if number > len(pdf.pages):
+            break
+        page = pdf.pages[number - 1]
+        texts.append(page.extract_text() + "\n\n")
+        if hasattr(page, "close"):
+            page.close()
+        else:
+            page.flush_cache()
+    return texts
@@ -0,0 +1,76 @@
+# Orthographic Translator - A program that converts texts between writing systems while maintaining word pronunciation.
+# Copyright 2022 Xavier Mercerweiss, xavifmw@gmail.com. Licensed under the MIT License.
+
+from collections import OrderedDict
+
+
+class UnknownWords:
+    """
+    Counts the words encountered during translation which have no mapping. Once the maximum number of distinct words
+    is reached, the least recently seen word is forgotten whenever a new word is counted, such that the memory used
+    remains constant regardless of how much text is translated.
+
+    :param max_size: The maximum number of distinct words counted at once.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.total = 0
+        self.evicted = 0
+        self._counts = OrderedDict()
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, word):
+        return word in self._counts
+
+    def __getitem__(self, word):
+        return self._counts.get(word, 0)
+
+    def add(self, word):
+        """
+        Counts a single occurrence of a given word.
+
+        :param word: The word to be counted.
+        """
+        self.total += 1
+        counts = self._counts
+        if word in counts:
+            counts[word] += 1
+            counts.move_to_end(word)
+        else:
+            counts[word] = 1
+            if len(counts) > self.max_size:
+                counts.popitem(last=False)
+                self.evicted += 1
+
+    def update(self, counts):
+        """
+        Counts several occurrences of each of a series of words.
+
+        :param counts: An iterable of tuples containing each word and its number of occurrences.
+        """
+        for word, count in counts:
+            self.add(word)
+            self.total += count - 1
+            if word in self._counts:
+                self._counts[word] += count - 1
+
+    def most_common(self, count=None):
+        """
+        Returns the most frequently counted words along with their counts.
+
+        :param count: The number of words to be returned. If none is provided, every counted word is returned.
+        :return: A list of tuples containing each word and its count, ordered from most to least frequent.
+        """
+        ordered = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return ordered if count is None else ordered[:count]
+
+    def clear(self):
+        """
+        Forgets every counted word.
+        """
+        self._counts.clear()
+        self.total = 0
+        self.evicted = 0